@@ -2,6 +2,7 @@ from flask import Flask, request, jsonify, send_file
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 import os
+import heapq
 import uuid
 import logging
 import time
@@ -45,6 +46,13 @@ app = Flask(__name__)
 app.config.from_object(Config)
 Config.init_app(app)
 
+# Use orjson for request/response JSON when available (same output format)
+try:
+    from utils.json_provider import OrjsonJSONProvider
+    app.json = OrjsonJSONProvider(app)
+except ImportError:
+    logger.info("orjson not installed, using Flask's default JSON provider")
+
 # Enable CORS for frontend integration
 CORS(app, origins=["http://localhost:3000", "http://localhost:5173"])
 
@@ -60,7 +68,9 @@ websocket_manager.init_app(app)
 jwt_manager.init_app(app)
 rate_limiter.init_app(app)
 
-# Store for tracking processing jobs
+# Store for tracking processing jobs. Request threads share it without a
+# lock: every access is a single dict operation (get/setitem/pop), and loops
+# iterate over a list() snapshot so concurrent inserts cannot break them.
 processing_jobs = {}
 
 def allowed_file(filename, allowed_extensions):
@@ -92,7 +102,8 @@ def cleanup_old_jobs():
         current_time = datetime.now()
         jobs_to_remove = []
 
-        for job_id, job in processing_jobs.items():
+        # Iterate over a snapshot; request threads may add jobs meanwhile
+        for job_id, job in list(processing_jobs.items()):
             job_age = current_time - job["created_at"]
 
             # Remove jobs older than retention period
@@ -210,7 +221,7 @@ def get_rate_limits():
 def health_check():
     """Comprehensive health check endpoint"""
     health_status = system_monitor.get_health_status()
-    dependency_status = health_checker.run_all_checks()
+    dependency_status = health_checker.run_all_checks(max_age=Config.HEALTH_CHECK_CACHE_SECONDS)
 
     overall_status = "healthy"
     if health_status['status'] != 'healthy' or dependency_status['overall_status'] != 'healthy':
@@ -259,8 +270,11 @@ def upload_files():
         audio_path = os.path.join(Config.UPLOAD_FOLDER, audio_filename)
         drt_path = os.path.join(Config.UPLOAD_FOLDER, drt_filename)
 
-        audio_file.save(audio_path)
-        drt_file.save(drt_path)
+        # Copy in large chunks; werkzeug's 16KB default means many small
+        # read/write calls for multi-MB audio spooled to a temp file
+        buffer_size = Config.UPLOAD_BUFFER_SIZE_KB * 1024
+        audio_file.save(audio_path, buffer_size=buffer_size)
+        drt_file.save(drt_path, buffer_size=buffer_size)
 
         # Initialize job tracking
         processing_jobs[job_id] = {
@@ -304,11 +318,10 @@ def process_timeline(job_id):
         # Validate job ID
         job_id = validate_job_id(job_id)
 
-        if job_id not in processing_jobs:
+        job = processing_jobs.get(job_id)
+        if job is None:
             return jsonify({"error": "Job not found"}), 404
 
-        job = processing_jobs[job_id]
-
         if job["status"] != "uploaded":
             return jsonify({"error": f"Job status is {job['status']}, cannot process"}), 400
 
@@ -348,8 +361,9 @@ def process_timeline(job_id):
         logger.error(f"Error submitting timeline processing for job {job_id}: {str(e)}")
 
         # Update job status on error
-        if job_id in processing_jobs:
-            processing_jobs[job_id].update({
+        job = processing_jobs.get(job_id)
+        if job is not None:
+            job.update({
                 "status": "failed",
                 "message": f"Failed to submit for processing: {str(e)}"
             })
@@ -385,11 +399,10 @@ def get_job_status(job_id):
         logger.warning(f"Failed to get job status from job manager: {str(e)}")
 
     # Fallback to in-memory storage
-    if job_id not in processing_jobs:
+    job = processing_jobs.get(job_id)
+    if job is None:
         return jsonify({"error": "Job not found"}), 404
 
-    job = processing_jobs[job_id]
-
     return jsonify({
         "job_id": job_id,
         "status": job["status"],
@@ -411,11 +424,10 @@ def download_result(job_id):
         # Validate job ID
         job_id = validate_job_id(job_id)
 
-        if job_id not in processing_jobs:
+        job = processing_jobs.get(job_id)
+        if job is None:
             return jsonify({"error": "Job not found"}), 404
 
-        job = processing_jobs[job_id]
-
         if job["status"] != "completed":
             return jsonify({"error": f"Job status is {job['status']}, no file available"}), 400
 
@@ -423,11 +435,14 @@ def download_result(job_id):
         if not output_file or not os.path.exists(output_file):
             return jsonify({"error": "Output file not found"}), 404
 
+        # Stream from disk; conditional enables ETag/If-None-Match and Range
+        # requests so clients can resume or skip unchanged downloads
         return send_file(
             output_file,
             as_attachment=True,
             download_name=f"edited_timeline_{job_id}.drt",
-            mimetype='application/xml'
+            mimetype='application/xml',
+            conditional=True
         )
 
     except Exception as e:
@@ -440,11 +455,10 @@ def get_transcription(job_id):
     # Validate job ID
     job_id = validate_job_id(job_id)
 
-    if job_id not in processing_jobs:
+    job = processing_jobs.get(job_id)
+    if job is None:
         return jsonify({"error": "Job not found"}), 404
 
-    job = processing_jobs[job_id]
-
     if not job.get("transcription_available"):
         return jsonify({"error": "No transcription available for this job"}), 404
 
@@ -457,11 +471,10 @@ def get_ai_enhancements(job_id):
     # Validate job ID
     job_id = validate_job_id(job_id)
 
-    if job_id not in processing_jobs:
+    job = processing_jobs.get(job_id)
+    if job is None:
         return jsonify({"error": "Job not found"}), 404
 
-    job = processing_jobs[job_id]
-
     if job["status"] != "completed":
         return jsonify({"error": f"Job status is {job['status']}, enhancements not available"}), 400
 
@@ -481,11 +494,10 @@ def get_processing_preview(job_id):
     # Validate job ID
     job_id = validate_job_id(job_id)
 
-    if job_id not in processing_jobs:
+    job = processing_jobs.get(job_id)
+    if job is None:
         return jsonify({"error": "Job not found"}), 404
 
-    job = processing_jobs[job_id]
-
     if job["status"] != "uploaded":
         return jsonify({"error": "Preview only available for uploaded jobs"}), 400
 
@@ -522,7 +534,7 @@ def list_jobs():
 
         # Get jobs from in-memory storage (fallback)
         memory_jobs = []
-        for job_id, job in processing_jobs.items():
+        for job_id, job in list(processing_jobs.items()):
             # Apply filters
             if job_type and job.get('type', 'timeline_processing') != job_type:
                 continue
@@ -547,13 +559,13 @@ def list_jobs():
             job["source"] = "redis"
             all_jobs[job["job_id"]] = job
 
-        # Convert to list and sort
-        jobs_list = list(all_jobs.values())
-        jobs_list.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+        # Only the newest `limit` jobs are returned, so select them with a
+        # bounded heap instead of sorting every job
+        newest_jobs = heapq.nlargest(limit, all_jobs.values(), key=lambda x: x.get("created_at", ""))
 
         return jsonify({
-            "jobs": jobs_list[:limit],
-            "total": len(jobs_list),
+            "jobs": newest_jobs,
+            "total": len(all_jobs),
             "filters": {
                 "type": job_type,
                 "status": status,
@@ -576,8 +588,9 @@ def cancel_job(job_id):
 
         if success:
             # Also update in-memory storage if exists
-            if job_id in processing_jobs:
-                processing_jobs[job_id].update({
+            job = processing_jobs.get(job_id)
+            if job is not None:
+                job.update({
                     "status": "cancelled",
                     "message": "Job cancelled by user",
                     "cancelled_at": datetime.now()
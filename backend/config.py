@@ -20,6 +20,7 @@ class Config:
     # File Processing Configuration
     MAX_FILE_SIZE_MB = int(os.getenv('MAX_FILE_SIZE_MB', '500'))
     MAX_CONTENT_LENGTH = MAX_FILE_SIZE_MB * 1024 * 1024  # Convert to bytes
+    UPLOAD_BUFFER_SIZE_KB = int(os.getenv('UPLOAD_BUFFER_SIZE_KB', '1024'))  # Copy chunk when saving uploads
     TEMP_FILE_RETENTION_HOURS = int(os.getenv('TEMP_FILE_RETENTION_HOURS', '24'))
     MAX_AUDIO_DURATION_HOURS = int(os.getenv('MAX_AUDIO_DURATION_HOURS', '6'))
 
@@ -43,6 +44,9 @@ class Config:
         'flac': 75,   # Lossless compression
     }
 
+    # Health endpoint: how long dependency check results are reused
+    HEALTH_CHECK_CACHE_SECONDS = int(os.getenv('HEALTH_CHECK_CACHE_SECONDS', '30'))
+
     # Upload and Temp Directories
     UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), 'uploads')
     TEMP_FOLDER = os.path.join(os.path.dirname(__file__), 'temp')
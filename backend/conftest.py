@@ -7,6 +7,7 @@ across all test modules.
 import pytest
 import tempfile
 import os
+import sys
 import shutil
 import numpy as np
 from scipy.io import wavfile
@@ -14,6 +15,35 @@ from pathlib import Path
 
 from models.timeline import Timeline, Track, Clip
 
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def pytest_addoption(parser):
+    """Register command line options for the backend test suite"""
+    parser.addoption(
+        "--runslow", action="store_true", default=False,
+        help="run tests marked as slow (skipped by default)"
+    )
+
+
+def pytest_configure(config):
+    """Make the backend packages importable once for every test module"""
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+
+    config.addinivalue_line("markers", "slow: marks tests as slow (run with --runslow)")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip slow tests unless --runslow is given"""
+    if config.getoption("--runslow"):
+        return
+
+    skip_slow = pytest.mark.skip(reason="slow test, use --runslow to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
 
 @pytest.fixture(scope="session")
 def temp_dir():
@@ -10,6 +10,7 @@ from utils.error_handlers import ValidationError, ProcessingError
 from datetime import datetime, timedelta
 import redis
 import json
+import heapq
 import logging
 import os
 
@@ -274,10 +275,8 @@ class JobManager:
                     logger.warning(f"Failed to parse job data for key {key}: {str(e)}")
                     continue
 
-            # Sort by creation time (newest first)
-            jobs.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-
-            return jobs[:limit]
+            # Newest `limit` jobs by creation time, without sorting them all
+            return heapq.nlargest(limit, jobs, key=lambda x: x.get('created_at', ''))
 
         except Exception as e:
             logger.error(f"Failed to list jobs: {str(e)}")
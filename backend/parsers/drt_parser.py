@@ -1,6 +1,8 @@
 import defusedxml.ElementTree as ET
+from defusedxml import DefusedXmlException
+import io
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
 from models.timeline import Timeline, Track, Clip
 import logging
 
@@ -44,23 +46,30 @@ class DRTParser:
             logger.exception(f"Unexpected error parsing .drt file {file_path}")
             raise ProcessingError(f"Failed to parse DRT file: {str(e)}")
 
-    def parse_content(self, xml_content: str) -> Timeline:
-        """Parse .drt XML content and return a Timeline object"""
+    def parse_content(self, xml_content: Union[str, bytes]) -> Timeline:
+        """Parse .drt XML content and return a Timeline object
+
+        Accepts either text or raw bytes; bytes are handed to the XML parser
+        as-is, which then honours the document's declared encoding.
+        """
         try:
-            if not xml_content or not isinstance(xml_content, str):
+            if not xml_content or not isinstance(xml_content, (str, bytes)):
                 raise ValidationError("Invalid XML content provided")
 
+            is_bytes = isinstance(xml_content, bytes)
             xml_content = xml_content.strip()
             if not xml_content:
                 raise ValidationError("XML content is empty")
 
             # Basic XML validation
-            if not xml_content.startswith('<'):
+            if not xml_content.startswith(b'<' if is_bytes else '<'):
                 raise ValidationError("Content does not appear to be valid XML")
 
-            # Secure XML parsing with defusedxml (automatic XXE protection)
-            root = ET.fromstring(xml_content)
-            data = self._xml_to_dict(root)
+            # Secure streaming parse with defusedxml. Entity declarations are
+            # rejected as soon as the DTD is seen, so entity-expansion payloads
+            # (billion laughs, XXE) fail fast instead of being expanded.
+            source = io.BytesIO(xml_content) if is_bytes else io.StringIO(xml_content)
+            data = self._iterparse_to_dict(source)
 
             # Extract timeline information
             timeline_data = self._extract_timeline_data(data)
@@ -77,6 +86,9 @@ class DRTParser:
         except ET.ParseError as e:
             logger.error(f"XML parsing error: {str(e)}")
             raise ValidationError(f"Invalid XML format: {str(e)}")
+        except DefusedXmlException as e:
+            logger.warning(f"Rejected unsafe XML construct: {str(e)}")
+            raise ValidationError(f"Forbidden XML construct: {str(e)}") from e
         except (ValidationError, ProcessingError):
             # Re-raise our custom errors
             raise
@@ -84,32 +96,52 @@ class DRTParser:
             logger.exception(f"Unexpected error parsing .drt content")
             raise ProcessingError(f"Failed to parse DRT content: {str(e)}")
 
-    def _xml_to_dict(self, element) -> Dict[str, Any]:
-        """Convert XML element to dictionary (secure replacement for xmltodict)"""
-        result = {}
+    def _iterparse_to_dict(self, source) -> Dict[str, Any]:
+        """Stream XML into a dictionary (secure replacement for xmltodict)
 
-        # Add attributes
-        if element.attrib:
-            for key, value in element.attrib.items():
-                result[f'@{key}'] = value
-
-        # Add children
-        for child in element:
-            child_data = self._xml_to_dict(child)
-            if child.tag in result:
-                # Multiple children with same tag - convert to list
-                if not isinstance(result[child.tag], list):
-                    result[child.tag] = [result[child.tag]]
-                result[child.tag].append(child_data)
-            else:
-                result[child.tag] = child_data
+        Elements are converted bottom-up as their end tags arrive and then
+        cleared, so the full element tree is never held in memory.
+        """
+        stack = []
+        result = {}
 
-        # Add text content
-        if element.text and element.text.strip():
-            if result:
-                result['#text'] = element.text.strip()
+        for event, element in ET.iterparse(
+            source,
+            events=('start', 'end'),
+            forbid_dtd=False,
+            forbid_entities=True,
+            forbid_external=True
+        ):
+            if event == 'start':
+                # Add attributes
+                stack.append({f'@{key}': value for key, value in element.attrib.items()})
+                continue
+
+            node = stack.pop()
+
+            # Add text content
+            text = element.text.strip() if element.text else ''
+            if text:
+                if node:
+                    node['#text'] = text
+                else:
+                    node = text
+
+            tag = element.tag
+            element.clear()
+
+            if not stack:
+                result = node
+                continue
+
+            # Add to parent; multiple children with same tag become a list
+            parent = stack[-1]
+            if tag in parent:
+                if not isinstance(parent[tag], list):
+                    parent[tag] = [parent[tag]]
+                parent[tag].append(node)
             else:
-                return element.text.strip()
+                parent[tag] = node
 
         return result
 
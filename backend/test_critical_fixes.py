@@ -13,6 +13,8 @@ from datetime import datetime
 # Add backend to path
 sys.path.insert(0, os.path.dirname(__file__))
 
+from tests.xml_payloads import BILLION_LAUGHS_XML
+
 def test_imports():
     """Test that all critical modules import without errors"""
     print("Testing imports...")
@@ -77,6 +79,19 @@ def test_secure_xml_parser():
         except Exception:
             print("  ✅ XXE attack blocked (parser rejected malicious XML)")
 
+        # Test billion laughs protection - must be refused at the DTD, not expanded
+        from defusedxml import EntitiesForbidden
+        from utils.error_handlers import ValidationError
+        try:
+            parser.parse_content(BILLION_LAUGHS_XML)
+            print("  ❌ Billion laughs payload was accepted")
+            return False
+        except ValidationError as e:
+            if not isinstance(e.__cause__, EntitiesForbidden):
+                print(f"  ❌ Billion laughs rejected for the wrong reason: {e}")
+                return False
+        print("  ✅ Billion laughs blocked (entity declarations forbidden)")
+
         return True
     except Exception as e:
         print(f"  ❌ XML parser test failed: {str(e)}")
@@ -307,24 +322,24 @@ def main():
         test_input_validation
     ]
 
-    results = []
-    for test in tests:
+    # Bit i of passed_mask is set when tests[i] passed
+    passed_mask = 0
+    for i, test in enumerate(tests):
         try:
-            result = test()
-            results.append(result)
+            if test():
+                passed_mask |= 1 << i
         except Exception as e:
             print(f"  💥 Test {test.__name__} crashed: {str(e)}")
-            results.append(False)
 
     print("\n" + "=" * 60)
     print("📊 TEST RESULTS SUMMARY")
     print("=" * 60)
 
-    passed = sum(results)
-    total = len(results)
+    passed = bin(passed_mask).count('1')
+    total = len(tests)
 
-    for i, (test, result) in enumerate(zip(tests, results)):
-        status = "✅ PASS" if result else "❌ FAIL"
+    for i, test in enumerate(tests):
+        status = "✅ PASS" if passed_mask >> i & 1 else "❌ FAIL"
         print(f"{i+1}. {test.__name__}: {status}")
 
     print(f"\n🎯 OVERALL: {passed}/{total} tests passed ({passed/total*100:.1f}%)")
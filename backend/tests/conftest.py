@@ -1,147 +1,19 @@
 import pytest
-import tempfile
-import shutil
 import os
-from unittest.mock import Mock, patch
+import copy
+import pickle
+import wave
+import math
 import numpy as np
-from scipy.io import wavfile
-
-# Import our application modules
-import sys
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from scipy.signal import resample_poly
 
+# Import our application modules (backend/ is put on sys.path by the
+# top-level conftest.py)
 from models.timeline import Timeline, Track, Clip
 
-# Try to import AudioAnalyzer, fall back to SimpleAudioAnalyzer if not available
-try:
-    from services.audio_analyzer import AudioAnalyzer
-except ImportError:
-    from services.simple_audio_analyzer import SimpleAudioAnalyzer as AudioAnalyzer
-
-from services.edit_rules import EditRulesEngine
-from parsers.drt_parser import DRTParser
-from parsers.drt_writer import DRTWriter
-
-@pytest.fixture
-def temp_dir():
-    """Create a temporary directory for tests"""
-    temp_directory = tempfile.mkdtemp()
-    yield temp_directory
-    shutil.rmtree(temp_directory)
-
-@pytest.fixture
-def sample_timeline():
-    """Create a sample timeline for testing"""
-    timeline = Timeline(name="Test Timeline", frame_rate=25.0, sample_rate=48000)
-
-    # Add audio track with clips
-    audio_track = Track(index=0, name="Audio Track", track_type="audio")
-
-    # Add some test clips
-    clip1 = Clip(
-        name="Clip 1",
-        start_time=0.0,
-        end_time=10.0,
-        duration=10.0,
-        track_index=0,
-        enabled=True
-    )
-
-    clip2 = Clip(
-        name="Clip 2",
-        start_time=15.0,
-        end_time=25.0,
-        duration=10.0,
-        track_index=0,
-        enabled=True
-    )
-
-    audio_track.add_clip(clip1)
-    audio_track.add_clip(clip2)
-    timeline.add_track(audio_track)
-
-    # Add some markers
-    timeline.add_marker(5.0, "Marker 1", "Red")
-    timeline.add_marker(20.0, "Marker 2", "Blue")
-
-    timeline.calculate_duration()
-    return timeline
-
-@pytest.fixture
-def sample_audio_data():
-    """Generate sample audio data for testing"""
-    duration = 30.0  # 30 seconds
-    sample_rate = 22050
-    samples = int(duration * sample_rate)
-
-    # Generate audio with speech-like patterns and silence
-    t = np.linspace(0, duration, samples)
-
-    # Create segments with different characteristics
-    audio = np.zeros(samples)
-
-    # Speech-like segment (0-10s)
-    speech_mask = (t >= 0) & (t < 10)
-    audio[speech_mask] = 0.3 * np.sin(2 * np.pi * 200 * t[speech_mask]) * np.random.random(np.sum(speech_mask))
-
-    # Silence segment (10-12s)
-    silence_mask = (t >= 10) & (t < 12)
-    audio[silence_mask] = 0.01 * np.random.random(np.sum(silence_mask))
-
-    # Another speech segment (12-25s)
-    speech_mask2 = (t >= 12) & (t < 25)
-    audio[speech_mask2] = 0.2 * np.sin(2 * np.pi * 300 * t[speech_mask2]) * np.random.random(np.sum(speech_mask2))
-
-    # Final silence (25-30s)
-    silence_mask2 = (t >= 25) & (t < 30)
-    audio[silence_mask2] = 0.005 * np.random.random(np.sum(silence_mask2))
-
-    return audio, sample_rate
-
-@pytest.fixture
-def sample_transcription_data():
-    """Create sample transcription data for testing"""
-    return {
-        'transcript': 'Hello, this is a test transcription with multiple speakers.',
-        'segments': [
-            {
-                'speaker': 'Speaker1',
-                'start_time': 0.5,
-                'end_time': 5.2,
-                'text': 'Hello, this is a test',
-                'confidence': 0.95,
-                'words': [
-                    {'text': 'Hello', 'start_time': 0.5, 'end_time': 1.0, 'confidence': 0.98},
-                    {'text': 'this', 'start_time': 1.2, 'end_time': 1.5, 'confidence': 0.95},
-                    {'text': 'is', 'start_time': 1.6, 'end_time': 1.8, 'confidence': 0.92},
-                    {'text': 'a', 'start_time': 1.9, 'end_time': 2.0, 'confidence': 0.90},
-                    {'text': 'test', 'start_time': 2.1, 'end_time': 2.8, 'confidence': 0.96}
-                ]
-            },
-            {
-                'speaker': 'Speaker2',
-                'start_time': 6.0,
-                'end_time': 12.5,
-                'text': 'transcription with multiple speakers',
-                'confidence': 0.87,
-                'words': [
-                    {'text': 'transcription', 'start_time': 6.0, 'end_time': 7.2, 'confidence': 0.88},
-                    {'text': 'with', 'start_time': 7.5, 'end_time': 7.8, 'confidence': 0.85},
-                    {'text': 'multiple', 'start_time': 8.0, 'end_time': 8.9, 'confidence': 0.89},
-                    {'text': 'speakers', 'start_time': 9.2, 'end_time': 10.1, 'confidence': 0.86}
-                ]
-            }
-        ],
-        'speakers': ['Speaker1', 'Speaker2'],
-        'duration': 12.5,
-        'confidence': 0.91,
-        'word_count': 9
-    }
-
-@pytest.fixture
-def sample_drt_xml():
-    """Sample DRT XML content for testing"""
-    return """<?xml version="1.0" encoding="UTF-8"?>
+# Sample DRT (xmeml) timeline shared by the DRT fixtures and helpers. Kept as
+# UTF-8 bytes so parsers and file writes never need to re-encode it.
+SAMPLE_DRT_XML_BYTES = b"""<?xml version="1.0" encoding="UTF-8"?>
 <!DOCTYPE xmeml>
 <xmeml version="5">
     <project>
@@ -235,77 +107,231 @@ def sample_drt_xml():
     </project>
 </xmeml>"""
 
+# Canned API payloads, built once at import time. The mock_* fixtures hand
+# out deep copies, so a test that edits its payload cannot affect others.
+_SONIOX_RESPONSE = {
+    'id': 'test-job-123',
+    'status': 'COMPLETED',
+    'transcript': 'This is a test transcript from Soniox API.',
+    'words': [
+        {
+            'text': 'This',
+            'start_ms': 500,
+            'end_ms': 800,
+            'confidence': 0.95,
+            'speaker': 'Speaker1'
+        },
+        {
+            'text': 'is',
+            'start_ms': 850,
+            'end_ms': 1000,
+            'confidence': 0.92,
+            'speaker': 'Speaker1'
+        },
+        {
+            'text': 'a',
+            'start_ms': 1050,
+            'end_ms': 1150,
+            'confidence': 0.88,
+            'speaker': 'Speaker1'
+        },
+        {
+            'text': 'test',
+            'start_ms': 1200,
+            'end_ms': 1600,
+            'confidence': 0.96,
+            'speaker': 'Speaker1'
+        }
+    ]
+}
+
+_OPENAI_RESPONSE = {
+    'choices': [{
+        'message': {
+            'content': 'This is an enhanced transcript with proper punctuation and grammar.'
+        }
+    }]
+}
+
+@pytest.fixture(scope="session")
+def _sample_timeline_blob():
+    """Build the sample timeline once per session and pickle it"""
+    timeline = Timeline(name="Test Timeline", frame_rate=25.0, sample_rate=48000)
+
+    # Add audio track with clips
+    audio_track = Track(index=0, name="Audio Track", track_type="audio")
+
+    # Add some test clips
+    clip1 = Clip(
+        name="Clip 1",
+        start_time=0.0,
+        end_time=10.0,
+        duration=10.0,
+        track_index=0,
+        enabled=True
+    )
+
+    clip2 = Clip(
+        name="Clip 2",
+        start_time=15.0,
+        end_time=25.0,
+        duration=10.0,
+        track_index=0,
+        enabled=True
+    )
+
+    audio_track.add_clip(clip1)
+    audio_track.add_clip(clip2)
+    timeline.add_track(audio_track)
+
+    # Add some markers
+    timeline.add_marker(5.0, "Marker 1", "Red")
+    timeline.add_marker(20.0, "Marker 2", "Blue")
+
+    timeline.calculate_duration()
+    return pickle.dumps(timeline)
+
 @pytest.fixture
-def mock_soniox_response():
-    """Mock response from Soniox API"""
+def sample_timeline(_sample_timeline_blob):
+    """Create a sample timeline for testing (fresh copy per test)"""
+    return pickle.loads(_sample_timeline_blob)
+
+@pytest.fixture(scope="session")
+def sample_timeline_ro(_sample_timeline_blob):
+    """Sample timeline shared across the session; only for tests that never mutate it"""
+    return pickle.loads(_sample_timeline_blob)
+
+@pytest.fixture(scope="session")
+def sample_audio_data():
+    """Generate sample audio data for testing (shared, read-only)"""
+    duration = 30.0  # 30 seconds
+    sample_rate = 22050
+    samples = int(duration * sample_rate)
+    rng = np.random.default_rng(0)
+
+    # Segments with different characteristics, filled slice by slice:
+    # speech-like (0-10s), silence (10-12s), speech (12-25s), silence (25-30s)
+    boundaries = (np.array([0, 10, 12, 25, 30]) * sample_rate).astype(int)
+    amplitudes = (0.3, 0.01, 0.2, 0.005)
+    frequencies = (200, 0, 300, 0)  # 0 = background noise only
+
+    # Each segment is generated straight into its slice of the output; only
+    # the sine phase needs a scratch buffer. Plain NumPy rather than a Numba
+    # kernel: the whole build takes a few milliseconds once per session,
+    # less than importing numba, which is not a test dependency.
+    audio = np.empty(samples, dtype=np.float32)
+    for i, (amplitude, frequency) in enumerate(zip(amplitudes, frequencies)):
+        start, end = boundaries[i], boundaries[i + 1]
+        segment = audio[start:end]
+        rng.random(dtype=np.float32, out=segment)
+        segment *= amplitude
+        if frequency:
+            phase = np.arange(start, end, dtype=np.float32)
+            phase *= np.float32(1.0 / sample_rate)
+            phase *= 2 * np.pi * frequency
+            segment *= np.sin(phase, out=phase)
+
+    # Shared across the session, so guard against in-place edits
+    audio.setflags(write=False)
+    return audio, sample_rate
+
+@pytest.fixture(scope="session")
+def resample_audio():
+    """Factory fixture to resample test audio between sample rates"""
+    def _resample(audio, orig_sr, target_sr):
+        if orig_sr == target_sr:
+            return audio
+        # Band-limited polyphase filtering by the gcd-reduced rate ratio
+        step = math.gcd(orig_sr, target_sr)
+        return resample_poly(audio, target_sr // step, orig_sr // step)
+
+    return _resample
+
+@pytest.fixture(scope="session")
+def sample_transcription_data():
+    """Create sample transcription data for testing"""
     return {
-        'id': 'test-job-123',
-        'status': 'COMPLETED',
-        'transcript': 'This is a test transcript from Soniox API.',
-        'words': [
+        'transcript': 'Hello, this is a test transcription with multiple speakers.',
+        'segments': [
             {
-                'text': 'This',
-                'start_ms': 500,
-                'end_ms': 800,
+                'speaker': 'Speaker1',
+                'start_time': 0.5,
+                'end_time': 5.2,
+                'text': 'Hello, this is a test',
                 'confidence': 0.95,
-                'speaker': 'Speaker1'
-            },
-            {
-                'text': 'is',
-                'start_ms': 850,
-                'end_ms': 1000,
-                'confidence': 0.92,
-                'speaker': 'Speaker1'
-            },
-            {
-                'text': 'a',
-                'start_ms': 1050,
-                'end_ms': 1150,
-                'confidence': 0.88,
-                'speaker': 'Speaker1'
+                'words': [
+                    {'text': 'Hello', 'start_time': 0.5, 'end_time': 1.0, 'confidence': 0.98},
+                    {'text': 'this', 'start_time': 1.2, 'end_time': 1.5, 'confidence': 0.95},
+                    {'text': 'is', 'start_time': 1.6, 'end_time': 1.8, 'confidence': 0.92},
+                    {'text': 'a', 'start_time': 1.9, 'end_time': 2.0, 'confidence': 0.90},
+                    {'text': 'test', 'start_time': 2.1, 'end_time': 2.8, 'confidence': 0.96}
+                ]
             },
             {
-                'text': 'test',
-                'start_ms': 1200,
-                'end_ms': 1600,
-                'confidence': 0.96,
-                'speaker': 'Speaker1'
+                'speaker': 'Speaker2',
+                'start_time': 6.0,
+                'end_time': 12.5,
+                'text': 'transcription with multiple speakers',
+                'confidence': 0.87,
+                'words': [
+                    {'text': 'transcription', 'start_time': 6.0, 'end_time': 7.2, 'confidence': 0.88},
+                    {'text': 'with', 'start_time': 7.5, 'end_time': 7.8, 'confidence': 0.85},
+                    {'text': 'multiple', 'start_time': 8.0, 'end_time': 8.9, 'confidence': 0.89},
+                    {'text': 'speakers', 'start_time': 9.2, 'end_time': 10.1, 'confidence': 0.86}
+                ]
             }
-        ]
+        ],
+        'speakers': ['Speaker1', 'Speaker2'],
+        'duration': 12.5,
+        'confidence': 0.91,
+        'word_count': 9
     }
 
+@pytest.fixture(scope="session")
+def sample_drt_xml():
+    """Sample DRT XML content for testing (UTF-8 bytes)"""
+    return SAMPLE_DRT_XML_BYTES
+
+@pytest.fixture
+def mock_soniox_response():
+    """Mock response from Soniox API (fresh copy per test)"""
+    return copy.deepcopy(_SONIOX_RESPONSE)
+
 @pytest.fixture
 def mock_openai_response():
-    """Mock response from OpenAI API"""
-    return {
-        'choices': [{
-            'message': {
-                'content': 'This is an enhanced transcript with proper punctuation and grammar.'
-            }
-        }]
-    }
+    """Mock response from OpenAI API (fresh copy per test)"""
+    return copy.deepcopy(_OPENAI_RESPONSE)
 
 # Helper functions for testing
 def create_test_audio_file(temp_dir, filename='test_audio.wav', duration=10.0, sample_rate=22050):
     """Create a test audio file"""
-    # Generate simple audio data
-    t = np.linspace(0, duration, int(duration * sample_rate))
-    audio_data = 0.3 * np.sin(2 * np.pi * 440 * t)
-    file_path = os.path.join(temp_dir, filename)
+    # Generate a 440 Hz tone in a single float32 buffer, scaled in place to
+    # int16 range so the only other allocation is the int16 output
+    samples = np.arange(int(duration * sample_rate), dtype=np.float32)
+    np.multiply(samples, np.float32(2 * np.pi * 440 / sample_rate), out=samples)
+    np.sin(samples, out=samples)
+    samples *= np.float32(0.3 * 32767)
+    audio_int16 = samples.astype('<i2')  # WAV PCM is little-endian
 
-    # Convert to int16 and write using scipy
-    audio_int16 = (audio_data * 32767).astype(np.int16)
-    wavfile.write(file_path, sample_rate, audio_int16)
+    # Mono 16-bit PCM written in one go with the stdlib wave module
+    file_path = os.path.join(temp_dir, filename)
+    with wave.open(file_path, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(audio_int16.tobytes())
 
     return file_path
 
 def create_test_drt_file(temp_dir, filename='test_timeline.drt', xml_content=None):
     """Create a test DRT file"""
     if xml_content is None:
-        xml_content = sample_drt_xml()
+        xml_content = SAMPLE_DRT_XML_BYTES
+    elif isinstance(xml_content, str):
+        xml_content = xml_content.encode('utf-8')
 
     file_path = os.path.join(temp_dir, filename)
-    with open(file_path, 'w', encoding='utf-8') as f:
+    with open(file_path, 'wb') as f:
         f.write(xml_content)
 
-    return file_path
\ No newline at end of file
+    return file_path
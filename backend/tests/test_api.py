@@ -1,57 +1,93 @@
 import pytest
-import os
 import json
-import tempfile
+import math
+import shutil
 from io import BytesIO
-from unittest.mock import patch, Mock
+from types import SimpleNamespace
+from unittest.mock import patch
 import soundfile as sf
 import numpy as np
 
-# Flask app testing
-from werkzeug.datastructures import FileStorage
-
-# Import app for testing
-import sys
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
+# Import app for testing (backend/ is put on sys.path by the top-level
+# conftest.py)
 from app import app, processing_jobs
 
+def tone_wav_bytes(duration, amplitude, sample_rate=22050, frequency=200):
+    """Encode a float32 sine tone as 16-bit PCM WAV bytes"""
+    # An integer tone repeats exactly every sample_rate / gcd samples (441 for
+    # 200Hz at 22050Hz), so evaluate sin over one period and tile it
+    period = sample_rate // math.gcd(frequency, sample_rate)
+    cycle = amplitude * np.sin(2 * np.pi * frequency / sample_rate * np.arange(period))
+    audio = np.resize(cycle.astype(np.float32), int(duration * sample_rate))
+    buffer = BytesIO()
+    sf.write(buffer, audio, sample_rate, subtype='PCM_16', format='WAV')
+    return buffer.getvalue()
+
+@pytest.fixture(scope="session")
+def test_audio_wav_bytes():
+    """10s upload tone, encoded once per session"""
+    return tone_wav_bytes(duration=10.0, amplitude=0.3)
+
+# pydub shells out to ffmpeg for every compressed format; probe for it once
+requires_ffmpeg = pytest.mark.skipif(shutil.which('ffmpeg') is None, reason="ffmpeg not installed")
+
+def _export_tone(**export_kwargs):
+    """Export a 2s 440Hz tone with pydub (needs ffmpeg) and return the bytes"""
+    try:
+        from pydub.generators import Sine
+
+        buffer = BytesIO()
+        Sine(440).to_audio_segment(duration=2000).export(buffer, **export_kwargs)
+    except Exception as e:
+        pytest.skip(f"{export_kwargs['format']} export unavailable (ffmpeg may not be installed): {str(e)}")
+    return buffer.getvalue()
+
+# (extension, pydub export arguments) for each compressed upload format
+_CODEC_EXPORTS = [
+    ('mp3', {'format': 'mp3', 'bitrate': '128k'}),
+    ('m4a', {'format': 'mp4', 'codec': 'aac'}),
+    ('flac', {'format': 'flac'}),
+]
+
+@pytest.fixture(scope="session", params=_CODEC_EXPORTS, ids=[ext for ext, _ in _CODEC_EXPORTS])
+def codec_tone(request):
+    """(extension, bytes) of the 2s tone in each compressed format, encoded once per session"""
+    ext, export_kwargs = request.param
+    return ext, _export_tone(**export_kwargs)
+
+@pytest.fixture(scope="module")
+def client():
+    """Create one Flask test client shared by the tests in this module"""
+    app.config['TESTING'] = True
+    app.config['WTF_CSRF_ENABLED'] = False
+
+    with app.test_client() as client:
+        yield client
+
+# Minimal timeline document for tests that only need a DRT file on disk
+EMPTY_TIMELINE_XML = b'<?xml version="1.0"?><timeline></timeline>'
+
+# Editing stats returned by the mocked EditRulesEngine
+_EDITING_STATS = {
+    'original_duration': 30.0,
+    'edited_duration': 25.0,
+    'duration_reduction': 5.0,
+    'compression_ratio': 25.0/30.0,
+    'original_clips': 3,
+    'edited_clips': 4,
+    'clips_change': 1,
+    'tracks_processed': 1,
+    'markers_added': 0
+}
+
 class TestAPIEndpoints:
     """Test cases for Flask API endpoints"""
 
-    @pytest.fixture
-    def client(self):
-        """Create Flask test client"""
-        app.config['TESTING'] = True
-        app.config['WTF_CSRF_ENABLED'] = False
-
-        with app.test_client() as client:
-            # Clear processing jobs for each test
-            processing_jobs.clear()
-            yield client
-
-    @pytest.fixture
-    def test_audio_file(self, temp_dir):
-        """Create test audio file for upload tests"""
-        # Generate simple test audio
-        duration = 10.0
-        sample_rate = 22050
-        t = np.linspace(0, duration, int(duration * sample_rate))
-        audio = 0.3 * np.sin(2 * np.pi * 200 * t)
-
-        audio_file = os.path.join(temp_dir, 'test_audio.wav')
-        sf.write(audio_file, audio, sample_rate)
-
-        return audio_file
-
-    @pytest.fixture
-    def test_drt_file(self, temp_dir, sample_drt_xml):
-        """Create test DRT file for upload tests"""
-        drt_file = os.path.join(temp_dir, 'test_timeline.drt')
-        with open(drt_file, 'w', encoding='utf-8') as f:
-            f.write(sample_drt_xml)
-
-        return drt_file
+    @pytest.fixture(autouse=True)
+    def _reset_jobs(self):
+        """Each test starts with no jobs and leaves the module-level store as it found it"""
+        with patch.dict(processing_jobs, clear=True):
+            yield
 
     def test_health_endpoint(self, client):
         """Test health check endpoint"""
@@ -66,6 +102,27 @@ class TestAPIEndpoints:
         assert 'system_health' in data
         assert 'dependencies' in data
 
+    def test_health_endpoint_caches_dependency_checks(self, client):
+        """Test that /health reuses dependency results for the configured window"""
+        from config import Config
+        from utils.monitoring import health_checker
+
+        # Expire whatever earlier requests cached so the first call runs every check
+        for check_info in health_checker.checks.values():
+            check_info['last_check'] = None
+
+        with patch.object(Config, 'HEALTH_CHECK_CACHE_SECONDS', 30), \
+                patch.object(health_checker, 'run_check', wraps=health_checker.run_check) as run_check:
+            first = client.get('/health')
+            calls_after_first = run_check.call_count
+            second = client.get('/health')
+
+        assert first.status_code == second.status_code == 200
+        assert calls_after_first == len(health_checker.checks) > 0
+        # The second request is inside the cache window and re-runs nothing
+        assert run_check.call_count == calls_after_first
+        assert second.get_json()['dependencies']['checks'] == first.get_json()['dependencies']['checks']
+
     def test_metrics_endpoint(self, client):
         """Test metrics endpoint"""
         response = client.get('/metrics')
@@ -78,9 +135,9 @@ class TestAPIEndpoints:
         assert 'system_metrics' in data
         assert 'request_metrics' in data
 
-    def test_upload_files_success(self, client, test_audio_file, test_drt_file):
+    def test_upload_files_success(self, client, test_audio_wav_bytes, sample_drt_xml):
         """Test successful file upload"""
-        with open(test_audio_file, 'rb') as audio, open(test_drt_file, 'rb') as drt:
+        with BytesIO(test_audio_wav_bytes) as audio, BytesIO(sample_drt_xml) as drt:
             response = client.post('/upload', data={
                 'audio': (audio, 'test_audio.wav'),
                 'drt': (drt, 'test_timeline.drt')
@@ -99,9 +156,9 @@ class TestAPIEndpoints:
         assert job_id in processing_jobs
         assert processing_jobs[job_id]['status'] == 'uploaded'
 
-    def test_upload_missing_audio_file(self, client, test_drt_file):
+    def test_upload_missing_audio_file(self, client, sample_drt_xml):
         """Test upload with missing audio file"""
-        with open(test_drt_file, 'rb') as drt:
+        with BytesIO(sample_drt_xml) as drt:
             response = client.post('/upload', data={
                 'drt': (drt, 'test_timeline.drt')
             }, content_type='multipart/form-data')
@@ -110,9 +167,9 @@ class TestAPIEndpoints:
         data = response.get_json()
         assert 'error' in data
 
-    def test_upload_missing_drt_file(self, client, test_audio_file):
+    def test_upload_missing_drt_file(self, client, test_audio_wav_bytes):
         """Test upload with missing DRT file"""
-        with open(test_audio_file, 'rb') as audio:
+        with BytesIO(test_audio_wav_bytes) as audio:
             response = client.post('/upload', data={
                 'audio': (audio, 'test_audio.wav')
             }, content_type='multipart/form-data')
@@ -121,12 +178,12 @@ class TestAPIEndpoints:
         data = response.get_json()
         assert 'error' in data
 
-    def test_upload_invalid_audio_format(self, client, test_drt_file):
+    def test_upload_invalid_audio_format(self, client, sample_drt_xml):
         """Test upload with invalid audio file format"""
         # Create fake file with wrong extension
         fake_audio = BytesIO(b'fake audio content')
 
-        with open(test_drt_file, 'rb') as drt:
+        with BytesIO(sample_drt_xml) as drt:
             response = client.post('/upload', data={
                 'audio': (fake_audio, 'fake_audio.txt'),  # Wrong format
                 'drt': (drt, 'test_timeline.drt')
@@ -167,60 +224,40 @@ class TestAPIEndpoints:
     @patch('app.EditRulesEngine')
     @patch('app.DRTWriter')
     def test_process_timeline_success_mock(self, mock_writer, mock_edit_engine,
-                                         mock_analyzer, mock_parser, client, temp_dir):
+                                         mock_analyzer, mock_parser, client, tmp_path):
         """Test successful timeline processing with mocked dependencies"""
-        # Setup mocks
-        mock_parser_instance = Mock()
-        mock_parser.return_value = mock_parser_instance
-        mock_timeline = Mock()
-        mock_timeline.duration = 30.0
-        mock_parser_instance.parse_file.return_value = mock_timeline
-
-        mock_analyzer_instance = Mock()
-        mock_analyzer.return_value = mock_analyzer_instance
+        # Setup mocks; the patched classes' return_value stands in for each
+        # instance, and plain data stands in where no call is made
+        mock_parser.return_value.parse_file.return_value = SimpleNamespace(duration=30.0)
+
+        mock_analyzer_instance = mock_analyzer.return_value
         mock_analyzer_instance.load_audio.return_value = True
         mock_analyzer_instance.detect_silence.return_value = []
         mock_analyzer_instance.detect_speech_segments.return_value = []
         mock_analyzer_instance.find_optimal_cut_points.return_value = []
         mock_analyzer_instance.analyze_audio_features.return_value = {}
 
-        mock_edit_instance = Mock()
-        mock_edit_engine.return_value = mock_edit_instance
-        mock_edited_timeline = Mock()
-        mock_edit_instance.apply_editing_rules.return_value = mock_edited_timeline
-        mock_edit_instance.get_editing_stats.return_value = {
-            'original_duration': 30.0,
-            'edited_duration': 25.0,
-            'duration_reduction': 5.0,
-            'compression_ratio': 25.0/30.0,
-            'original_clips': 3,
-            'edited_clips': 4,
-            'clips_change': 1,
-            'tracks_processed': 1,
-            'markers_added': 0
-        }
+        mock_edit_instance = mock_edit_engine.return_value
+        mock_edit_instance.apply_editing_rules.return_value = SimpleNamespace(duration=25.0)
+        mock_edit_instance.get_editing_stats.return_value = dict(_EDITING_STATS)
 
-        mock_writer_instance = Mock()
-        mock_writer.return_value = mock_writer_instance
-        mock_writer_instance.write_timeline.return_value = True
+        mock_writer.return_value.write_timeline.return_value = True
 
         # Create job
         job_id = 'test_job_123'
-        audio_file = os.path.join(temp_dir, 'fake_audio.wav')
-        drt_file = os.path.join(temp_dir, 'fake_timeline.drt')
+        audio_file = tmp_path / 'fake_audio.wav'
+        drt_file = tmp_path / 'fake_timeline.drt'
 
         # Create fake files
-        with open(audio_file, 'w') as f:
-            f.write('fake audio')
-        with open(drt_file, 'w') as f:
-            f.write('fake drt')
+        audio_file.write_bytes(b'fake audio')
+        drt_file.write_bytes(b'fake drt')
 
         processing_jobs[job_id] = {
             'status': 'uploaded',
             'progress': 10,
             'message': 'Ready for processing',
-            'audio_file': audio_file,
-            'drt_file': drt_file,
+            'audio_file': str(audio_file),
+            'drt_file': str(drt_file),
             'created_at': '2024-01-01T00:00:00'
         }
 
@@ -274,19 +311,18 @@ class TestAPIEndpoints:
         data = response.get_json()
         assert 'error' in data
 
-    def test_download_result_success(self, client, temp_dir):
+    def test_download_result_success(self, client, tmp_path):
         """Test successful file download"""
         # Create fake output file
-        output_file = os.path.join(temp_dir, 'output_timeline.drt')
-        with open(output_file, 'w') as f:
-            f.write('<?xml version="1.0"?><timeline></timeline>')
+        output_file = tmp_path / 'output_timeline.drt'
+        output_file.write_bytes(EMPTY_TIMELINE_XML)
 
         job_id = 'test_job_123'
         processing_jobs[job_id] = {
             'status': 'completed',
             'progress': 100,
             'message': 'Processing completed',
-            'output_file': output_file
+            'output_file': str(output_file)
         }
 
         response = client.get(f'/download/{job_id}')
@@ -391,40 +427,37 @@ class TestAPIEndpoints:
         data = response.get_json()
         assert 'error' in data
 
-    def test_get_processing_preview(self, client, temp_dir):
+    @patch('services.timeline_editor.TimelineEditingEngine')
+    def test_get_processing_preview(self, mock_engine, client):
         """Test getting processing preview"""
-        # Create minimal test files
-        audio_file = os.path.join(temp_dir, 'preview_audio.wav')
-        drt_file = os.path.join(temp_dir, 'preview_timeline.drt')
-
-        # Create simple audio file
-        duration = 5.0
-        sample_rate = 22050
-        t = np.linspace(0, duration, int(duration * sample_rate))
-        audio = 0.2 * np.sin(2 * np.pi * 200 * t)
-        sf.write(audio_file, audio, sample_rate)
-
-        # Create simple DRT
-        with open(drt_file, 'w') as f:
-            f.write('<?xml version="1.0"?><timeline><name>Preview</name></timeline>')
+        preview = {
+            'success': True,
+            'preview': {
+                'estimated_changes': {
+                    'silence_segments_to_remove': 2,
+                    'estimated_duration_reduction_seconds': 1.5,
+                    'estimated_compression_ratio': 0.7
+                }
+            }
+        }
+        mock_engine.return_value.get_processing_preview.return_value = preview
 
         job_id = 'preview_job_123'
         processing_jobs[job_id] = {
             'status': 'uploaded',
-            'audio_file': audio_file,
-            'drt_file': drt_file
+            'audio_file': 'preview_audio.wav',
+            'drt_file': 'preview_timeline.drt'
         }
 
         response = client.get(f'/preview/{job_id}')
 
-        # This might fail if TimelineEditingEngine is not properly mocked
-        # But we're testing the endpoint structure
-        assert response.status_code in [200, 500]  # Either success or expected failure
-
-        if response.status_code == 200:
-            data = response.get_json()
-            assert data['job_id'] == job_id
-            assert 'preview' in data
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['job_id'] == job_id
+        assert data['preview'] == preview
+        mock_engine.return_value.get_processing_preview.assert_called_once_with(
+            'preview_audio.wav', 'preview_timeline.drt'
+        )
 
     def test_manual_cleanup(self, client):
         """Test manual cleanup endpoint"""
@@ -500,13 +533,13 @@ class TestAPIEndpoints:
         data = response.get_json()
         assert 'error' in data
 
-    def test_concurrent_job_processing(self, client, test_audio_file, test_drt_file):
+    def test_concurrent_job_processing(self, client, test_audio_wav_bytes, sample_drt_xml):
         """Test handling multiple concurrent jobs"""
         job_ids = []
 
         # Create multiple jobs
         for i in range(3):
-            with open(test_audio_file, 'rb') as audio, open(test_drt_file, 'rb') as drt:
+            with BytesIO(test_audio_wav_bytes) as audio, BytesIO(sample_drt_xml) as drt:
                 response = client.post('/upload', data={
                     'audio': (audio, f'test_audio_{i}.wav'),
                     'drt': (drt, f'test_timeline_{i}.drt')
@@ -526,123 +559,57 @@ class TestAPIEndpoints:
             response = client.get(f'/status/{job_id}')
             assert response.status_code == 200
 
-    def test_upload_mp3_file(self, client, temp_dir, test_drt_file):
-        """Test uploading MP3 audio file"""
-        # Create a test MP3 file using pydub
-        try:
-            from pydub import AudioSegment
-            from pydub.generators import Sine
-
-            # Generate 2 seconds of 440Hz tone
-            tone = Sine(440).to_audio_segment(duration=2000)
-            mp3_file = os.path.join(temp_dir, 'test_audio.mp3')
-            tone.export(mp3_file, format='mp3', bitrate='128k')
-
-            with open(mp3_file, 'rb') as audio, open(test_drt_file, 'rb') as drt:
-                response = client.post('/upload', data={
-                    'audio': (audio, 'test_audio.mp3'),
-                    'drt': (drt, 'test_timeline.drt')
-                }, content_type='multipart/form-data')
-
-            assert response.status_code == 200
-            data = response.get_json()
-            assert 'job_id' in data
-            assert data['audio_filename'] == 'test_audio.mp3'
-
-        except Exception as e:
-            pytest.skip(f"MP3 test skipped (ffmpeg may not be installed): {str(e)}")
-
-    def test_upload_m4a_file(self, client, temp_dir, test_drt_file):
-        """Test uploading M4A audio file"""
-        try:
-            from pydub import AudioSegment
-            from pydub.generators import Sine
-
-            # Generate 2 seconds of 440Hz tone
-            tone = Sine(440).to_audio_segment(duration=2000)
-            m4a_file = os.path.join(temp_dir, 'test_audio.m4a')
-            tone.export(m4a_file, format='mp4', codec='aac')
-
-            with open(m4a_file, 'rb') as audio, open(test_drt_file, 'rb') as drt:
-                response = client.post('/upload', data={
-                    'audio': (audio, 'test_audio.m4a'),
-                    'drt': (drt, 'test_timeline.drt')
-                }, content_type='multipart/form-data')
-
-            assert response.status_code == 200
-            data = response.get_json()
-            assert 'job_id' in data
-            assert data['audio_filename'] == 'test_audio.m4a'
-
-        except Exception as e:
-            pytest.skip(f"M4A test skipped (ffmpeg may not be installed): {str(e)}")
-
-    def test_upload_flac_file(self, client, temp_dir, test_drt_file):
-        """Test uploading FLAC audio file"""
-        try:
-            from pydub import AudioSegment
-            from pydub.generators import Sine
-
-            # Generate 2 seconds of 440Hz tone
-            tone = Sine(440).to_audio_segment(duration=2000)
-            flac_file = os.path.join(temp_dir, 'test_audio.flac')
-            tone.export(flac_file, format='flac')
-
-            with open(flac_file, 'rb') as audio, open(test_drt_file, 'rb') as drt:
-                response = client.post('/upload', data={
-                    'audio': (audio, 'test_audio.flac'),
-                    'drt': (drt, 'test_timeline.drt')
-                }, content_type='multipart/form-data')
-
-            assert response.status_code == 200
-            data = response.get_json()
-            assert 'job_id' in data
-            assert data['audio_filename'] == 'test_audio.flac'
+    @requires_ffmpeg
+    def test_upload_compressed_audio(self, client, sample_drt_xml, codec_tone):
+        """Test uploading MP3, M4A and FLAC audio files"""
+        ext, audio_bytes = codec_tone
+        filename = f'test_audio.{ext}'
+        with BytesIO(audio_bytes) as audio, BytesIO(sample_drt_xml) as drt:
+            response = client.post('/upload', data={
+                'audio': (audio, filename),
+                'drt': (drt, 'test_timeline.drt')
+            }, content_type='multipart/form-data')
 
-        except Exception as e:
-            pytest.skip(f"FLAC test skipped (ffmpeg may not be installed): {str(e)}")
+        assert response.status_code == 200
+        data = response.get_json()
+        assert 'job_id' in data
+        assert data['audio_filename'] == filename
 
-    def test_process_mp3_file_end_to_end(self, client, temp_dir, test_drt_file):
+    @requires_ffmpeg
+    def test_process_mp3_file_end_to_end(self, client, sample_drt_xml):
         """Test complete workflow with MP3 file: upload -> process -> download"""
-        try:
-            from pydub import AudioSegment
-            from pydub.generators import Sine
-
-            # Generate 5 seconds of audio with silence
-            tone1 = Sine(440).to_audio_segment(duration=1000)
-            silence = AudioSegment.silent(duration=1000)
-            tone2 = Sine(880).to_audio_segment(duration=1000)
-            audio = tone1 + silence + tone2 + silence + tone1
-
-            mp3_file = os.path.join(temp_dir, 'test_workflow.mp3')
-            audio.export(mp3_file, format='mp3', bitrate='128k')
-
-            # Upload
-            with open(mp3_file, 'rb') as audio_f, open(test_drt_file, 'rb') as drt:
-                upload_response = client.post('/upload', data={
-                    'audio': (audio_f, 'test_workflow.mp3'),
-                    'drt': (drt, 'test_timeline.drt')
-                }, content_type='multipart/form-data')
-
-            assert upload_response.status_code == 200
-            job_id = upload_response.get_json()['job_id']
+        pydub = pytest.importorskip('pydub')
+        from pydub.generators import Sine
+
+        # Generate 5 seconds of audio with silence
+        tone1 = Sine(440).to_audio_segment(duration=1000)
+        silence = pydub.AudioSegment.silent(duration=1000)
+        tone2 = Sine(880).to_audio_segment(duration=1000)
+        audio = tone1 + silence + tone2 + silence + tone1
+
+        mp3_data = BytesIO()
+        audio.export(mp3_data, format='mp3', bitrate='128k')
+        mp3_data.seek(0)
+
+        # Upload
+        with mp3_data as audio_f, BytesIO(sample_drt_xml) as drt:
+            upload_response = client.post('/upload', data={
+                'audio': (audio_f, 'test_workflow.mp3'),
+                'drt': (drt, 'test_timeline.drt')
+            }, content_type='multipart/form-data')
 
-            # Check status
-            status_response = client.get(f'/status/{job_id}')
-            assert status_response.status_code == 200
-            assert status_response.get_json()['status'] == 'uploaded'
+        assert upload_response.status_code == 200
+        job_id = upload_response.get_json()['job_id']
 
-        except Exception as e:
-            pytest.skip(f"MP3 workflow test skipped (ffmpeg may not be installed): {str(e)}")
+        # Check status
+        status_response = client.get(f'/status/{job_id}')
+        assert status_response.status_code == 200
+        assert status_response.get_json()['status'] == 'uploaded'
 
-    def test_unsupported_audio_format(self, client, temp_dir, test_drt_file):
+    def test_unsupported_audio_format(self, client, sample_drt_xml):
         """Test that unsupported audio formats are rejected"""
-        # Create a fake .xyz file
-        fake_audio = os.path.join(temp_dir, 'fake.xyz')
-        with open(fake_audio, 'wb') as f:
-            f.write(b'not a real audio file')
-
-        with open(fake_audio, 'rb') as audio, open(test_drt_file, 'rb') as drt:
+        # Fake .xyz upload
+        with BytesIO(b'not a real audio file') as audio, BytesIO(sample_drt_xml) as drt:
             response = client.post('/upload', data={
                 'audio': (audio, 'fake.xyz'),
                 'drt': (drt, 'test_timeline.drt')
@@ -650,4 +617,4 @@ class TestAPIEndpoints:
 
         assert response.status_code == 400
         data = response.get_json()
-        assert 'error' in data
\ No newline at end of file
+        assert 'error' in data
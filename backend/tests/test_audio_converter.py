@@ -4,147 +4,234 @@ Tests for audio format converter
 
 import pytest
 import os
-import tempfile
+import shutil
+import functools
+import contextlib
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 import numpy as np
 from scipy.io import wavfile
 from pydub import AudioSegment
 from services.audio_converter import AudioFormatConverter
 
+try:
+    from filelock import FileLock
+except ImportError:
+    # Only needed to share the audio cache between pytest-xdist workers
+    FileLock = None
 
-@pytest.fixture
-def temp_dir():
-    """Create a temporary directory for test files"""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield tmpdir
+
+# Tests that need compressed source files are skipped up front without
+# ffmpeg, so the encode fixtures are never set up there
+requires_ffmpeg = pytest.mark.skipif(shutil.which('ffmpeg') is None, reason="ffmpeg not installed")
 
 
 @pytest.fixture
-def converter(temp_dir):
+def converter(tmp_path):
     """Create an AudioFormatConverter instance"""
-    return AudioFormatConverter(temp_dir)
+    return AudioFormatConverter(tmp_path)
 
 
-@pytest.fixture
-def test_wav_file(temp_dir):
-    """Create a test WAV file"""
+@pytest.fixture(scope="session")
+def audio_cache_dir(tmp_path_factory):
+    """
+    Directory holding the source audio files, built once per run.
+
+    Under pytest-xdist every worker has its own base temp dir, but they
+    share a per-run parent; the cache lives there so the files are encoded
+    once in total rather than once per worker.
+    """
+    if os.environ.get('PYTEST_XDIST_WORKER') and FileLock is not None:
+        cache_dir = tmp_path_factory.getbasetemp().parent / 'audio_cache'
+        cache_dir.mkdir(exist_ok=True)
+        return cache_dir
+    return tmp_path_factory.mktemp('audio_cache')
+
+
+def _cache_lock(cache_dir):
+    """Serialize cache builds between xdist workers (no-op in a single process)"""
+    if os.environ.get('PYTEST_XDIST_WORKER') and FileLock is not None:
+        return FileLock(os.path.join(cache_dir, 'audio_cache.lock'))
+    return contextlib.nullcontext()
+
+
+@pytest.fixture(scope="session")
+def cached_wav_file(audio_cache_dir):
+    """Create the source WAV file once per session"""
     sample_rate = 22050
     duration = 2.0  # seconds
     frequency = 440  # Hz (A4 note)
 
-    # Generate a simple sine wave
-    t = np.linspace(0, duration, int(sample_rate * duration))
-    audio_data = np.sin(2 * np.pi * frequency * t)
+    wav_path = os.path.join(audio_cache_dir, 'test.wav')
+    with _cache_lock(audio_cache_dir):
+        if os.path.exists(wav_path):
+            return wav_path
 
-    # Convert to 16-bit PCM
-    audio_data = (audio_data * 32767).astype(np.int16)
+        # Generate a simple sine wave in one float32 buffer, then convert it
+        # to 16-bit PCM
+        phase = np.arange(int(sample_rate * duration), dtype=np.float32)
+        phase *= np.float32(2 * np.pi * frequency / sample_rate)
+        samples = np.sin(phase, out=phase)
+        samples *= 32767
+        audio_data = samples.astype(np.int16)
 
-    # Save as WAV
-    wav_path = os.path.join(temp_dir, 'test.wav')
-    wavfile.write(wav_path, sample_rate, audio_data)
+        # Save as WAV
+        wavfile.write(wav_path, sample_rate, audio_data)
 
     return wav_path
 
 
-@pytest.fixture
-def test_mp3_file(test_wav_file, temp_dir):
-    """Create a test MP3 file from WAV"""
-    try:
-        audio = AudioSegment.from_wav(test_wav_file)
-        mp3_path = os.path.join(temp_dir, 'test.mp3')
-        audio.export(mp3_path, format='mp3', bitrate='128k')
-        return mp3_path
-    except Exception as e:
-        pytest.skip(f"Could not create MP3 file (ffmpeg may not be installed): {str(e)}")
+# Compressed formats derived from the cached WAV: file name, ffmpeg codec args
+_EXPORTS = {
+    'mp3': ('test.mp3', ('-codec:a', 'libmp3lame', '-b:a', '128k')),
+    'm4a': ('test.m4a', ('-codec:a', 'aac', '-b:a', '128k')),
+    'flac': ('test.flac', ('-codec:a', 'flac')),
+}
 
 
-@pytest.fixture
-def test_m4a_file(test_wav_file, temp_dir):
-    """Create a test M4A file from WAV"""
-    try:
-        audio = AudioSegment.from_wav(test_wav_file)
-        m4a_path = os.path.join(temp_dir, 'test.m4a')
-        audio.export(m4a_path, format='mp4', codec='aac')
-        return m4a_path
-    except Exception as e:
-        pytest.skip(f"Could not create M4A file (ffmpeg may not be installed): {str(e)}")
+def _ffmpeg_transcode(src, dst, *args):
+    """Transcode src to dst with a single ffmpeg run"""
+    subprocess.run(
+        ['ffmpeg', '-loglevel', 'error', '-y', '-i', src, *args, dst],
+        check=True, capture_output=True
+    )
+
+
+@pytest.fixture(scope="session")
+def encoded_audio_files(audio_cache_dir, cached_wav_file):
+    """
+    Encode the cached WAV to every compressed format once per session.
+
+    Files already in the cache (built by another xdist worker) are reused.
+    The remaining ffmpeg transcodes run concurrently, since each one mostly
+    waits on its subprocess. Maps each format to its path. Only requested
+    by tests marked requires_ffmpeg, so a failed transcode is an error.
+    """
+    paths = {fmt: os.path.join(audio_cache_dir, name) for fmt, (name, _) in _EXPORTS.items()}
+
+    with _cache_lock(audio_cache_dir):
+        missing = [fmt for fmt, path in paths.items() if not os.path.exists(path)]
+        if missing:
+            with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+                futures = {
+                    fmt: executor.submit(_ffmpeg_transcode, cached_wav_file, paths[fmt], *_EXPORTS[fmt][1])
+                    for fmt in missing
+                }
+
+            for fmt, future in futures.items():
+                try:
+                    future.result()
+                except Exception:
+                    # Never leave a partial file behind for other workers to pick up
+                    if os.path.exists(paths[fmt]):
+                        os.remove(paths[fmt])
+                    raise
+
+    return paths
+
+
+@functools.lru_cache(maxsize=32)
+def _probe(path):
+    """Decode a session-cached audio file once; returns (duration_seconds, channels, frame_rate)"""
+    audio = AudioSegment.from_file(path)
+    return len(audio) / 1000.0, audio.channels, audio.frame_rate
+
+
+@pytest.fixture(scope="session")
+def cached_mp3_file(encoded_audio_files):
+    """Source MP3 file, encoded once per session"""
+    return encoded_audio_files['mp3']
+
 
+@pytest.fixture(scope="session")
+def cached_m4a_file(encoded_audio_files):
+    """Source M4A file, encoded once per session"""
+    return encoded_audio_files['m4a']
+
+
+@pytest.fixture(scope="session")
+def cached_flac_file(encoded_audio_files):
+    """Source FLAC file, encoded once per session"""
+    return encoded_audio_files['flac']
+
+
+@pytest.fixture(scope="session")
+def corrupted_mp3_file(tmp_path_factory):
+    """Create a fake "MP3" file with garbage data once per session"""
+    corrupted_file = tmp_path_factory.mktemp('corrupted') / 'corrupted.mp3'
+    corrupted_file.write_bytes(b'This is not a valid audio file')
+    return str(corrupted_file)
+
+
+# Conversions write their output next to the input file, so each test gets
+# its own copy of the cached source in tmp_path
 
 @pytest.fixture
-def test_flac_file(test_wav_file, temp_dir):
-    """Create a test FLAC file from WAV"""
-    try:
-        audio = AudioSegment.from_wav(test_wav_file)
-        flac_path = os.path.join(temp_dir, 'test.flac')
-        audio.export(flac_path, format='flac')
-        return flac_path
-    except Exception as e:
-        pytest.skip(f"Could not create FLAC file (ffmpeg may not be installed): {str(e)}")
+def test_wav_file(cached_wav_file, tmp_path):
+    """Create a test WAV file"""
+    return shutil.copyfile(cached_wav_file, os.path.join(tmp_path, 'test.wav'))
 
 
-class TestAudioFormatConverter:
-    """Test suite for AudioFormatConverter"""
+@pytest.fixture
+def test_mp3_file(cached_mp3_file, tmp_path):
+    """Create a test MP3 file"""
+    return shutil.copyfile(cached_mp3_file, os.path.join(tmp_path, 'test.mp3'))
 
-    def test_needs_conversion_wav(self, converter, test_wav_file):
-        """Test that WAV files don't need conversion"""
-        assert not converter.needs_conversion(test_wav_file)
 
-    def test_needs_conversion_mp3(self, converter, temp_dir):
-        """Test that MP3 files need conversion"""
-        mp3_path = os.path.join(temp_dir, 'test.mp3')
-        assert converter.needs_conversion(mp3_path)
+@pytest.fixture
+def test_m4a_file(cached_m4a_file, tmp_path):
+    """Create a test M4A file"""
+    return shutil.copyfile(cached_m4a_file, os.path.join(tmp_path, 'test.m4a'))
 
-    def test_needs_conversion_m4a(self, converter, temp_dir):
-        """Test that M4A files need conversion"""
-        m4a_path = os.path.join(temp_dir, 'test.m4a')
-        assert converter.needs_conversion(m4a_path)
 
-    def test_needs_conversion_flac(self, converter, temp_dir):
-        """Test that FLAC files need conversion"""
-        flac_path = os.path.join(temp_dir, 'test.flac')
-        assert converter.needs_conversion(flac_path)
+@pytest.fixture
+def test_flac_file(cached_flac_file, tmp_path):
+    """Create a test FLAC file"""
+    return shutil.copyfile(cached_flac_file, os.path.join(tmp_path, 'test.flac'))
 
-    def test_convert_mp3_to_wav(self, converter, test_mp3_file, temp_dir):
-        """Test MP3 to WAV conversion"""
-        success, wav_path, error = converter.convert_to_wav(test_mp3_file)
 
-        assert success, f"Conversion failed: {error}"
-        assert wav_path is not None
-        assert os.path.exists(wav_path)
-        assert wav_path.endswith('.converted.wav')
+@pytest.fixture
+def source_file(request):
+    """Resolve the per-test source file fixture named by the parametrization"""
+    return request.getfixturevalue(request.param)
 
-        # Verify it's a valid WAV file
-        sr, data = wavfile.read(wav_path)
-        assert sr > 0
-        assert len(data) > 0
 
-    def test_convert_m4a_to_wav(self, converter, test_m4a_file, temp_dir):
-        """Test M4A to WAV conversion"""
-        success, wav_path, error = converter.convert_to_wav(test_m4a_file)
+class TestAudioFormatConverter:
+    """Test suite for AudioFormatConverter"""
 
-        assert success, f"Conversion failed: {error}"
-        assert wav_path is not None
-        assert os.path.exists(wav_path)
-        assert wav_path.endswith('.converted.wav')
+    def test_needs_conversion_wav(self, converter, test_wav_file):
+        """Test that WAV files don't need conversion"""
+        assert not converter.needs_conversion(test_wav_file)
 
-        # Verify it's a valid WAV file
-        sr, data = wavfile.read(wav_path)
-        assert sr > 0
-        assert len(data) > 0
+    @pytest.mark.parametrize("extension", ['mp3', 'm4a', 'flac'])
+    def test_needs_conversion_compressed(self, converter, tmp_path, extension):
+        """Test that MP3, M4A and FLAC files need conversion"""
+        compressed_path = os.path.join(tmp_path, f'test.{extension}')
+        assert converter.needs_conversion(compressed_path)
 
-    def test_convert_flac_to_wav(self, converter, test_flac_file, temp_dir):
-        """Test FLAC to WAV conversion"""
-        success, wav_path, error = converter.convert_to_wav(test_flac_file)
+    @requires_ffmpeg
+    @pytest.mark.parametrize("source_file", ['test_mp3_file', 'test_m4a_file', 'test_flac_file'],
+                             indirect=True, ids=['mp3', 'm4a', 'flac'])
+    def test_convert_to_wav(self, converter, source_file):
+        """Test MP3, M4A and FLAC to WAV conversion"""
+        success, wav_path, error = converter.convert_to_wav(source_file)
 
         assert success, f"Conversion failed: {error}"
         assert wav_path is not None
-        assert os.path.exists(wav_path)
-        assert wav_path.endswith('.converted.wav')
+        converted = Path(wav_path)
+        assert converted.exists()
+        assert converted.name.endswith('.converted.wav')
 
         # Verify it's a valid WAV file
-        sr, data = wavfile.read(wav_path)
+        sr, data = wavfile.read(converted)
         assert sr > 0
         assert len(data) > 0
 
+        # Real conversion outputs must be removable by cleanup
+        assert converter.cleanup_converted_file(wav_path)
+        assert not converted.exists()
+
     def test_convert_nonexistent_file(self, converter):
         """Test conversion of non-existent file"""
         success, wav_path, error = converter.convert_to_wav('/nonexistent/file.mp3')
@@ -154,21 +241,22 @@ class TestAudioFormatConverter:
         assert error is not None
         assert 'not found' in error.lower()
 
-    def test_convert_with_custom_output_path(self, converter, test_mp3_file, temp_dir):
+    @requires_ffmpeg
+    def test_convert_with_custom_output_path(self, converter, test_mp3_file, tmp_path):
         """Test conversion with custom output path"""
-        custom_output = os.path.join(temp_dir, 'custom_output.wav')
+        custom_output = os.path.join(tmp_path, 'custom_output.wav')
         success, wav_path, error = converter.convert_to_wav(test_mp3_file, custom_output)
 
         assert success, f"Conversion failed: {error}"
         assert wav_path == custom_output
         assert os.path.exists(custom_output)
 
-    def test_cleanup_converted_file(self, converter, test_mp3_file):
+    def test_cleanup_converted_file(self, converter, tmp_path):
         """Test cleanup of converted files"""
-        # Convert file
-        success, wav_path, error = converter.convert_to_wav(test_mp3_file)
-        assert success
-        assert os.path.exists(wav_path)
+        # Cleanup only looks at the name and location, so a stub stands in
+        # for a real conversion output (test_convert_to_wav covers that path)
+        wav_path = os.path.join(tmp_path, 'stub.converted.wav')
+        open(wav_path, 'wb').close()
 
         # Clean up
         cleanup_success = converter.cleanup_converted_file(wav_path)
@@ -196,6 +284,7 @@ class TestAudioFormatConverter:
         assert info['format'] == 'wav'
         assert info['duration_seconds'] > 0
 
+    @requires_ffmpeg
     def test_get_audio_info_mp3(self, converter, test_mp3_file):
         """Test getting audio info for MP3 file"""
         info = converter.get_audio_info(test_mp3_file)
@@ -218,19 +307,22 @@ class TestAudioFormatConverter:
         assert available
         assert message is not None
 
-    def test_converted_file_naming(self, converter, test_mp3_file, temp_dir):
+    @requires_ffmpeg
+    def test_converted_file_naming(self, converter, test_mp3_file, tmp_path):
         """Test that converted files are named correctly"""
         success, wav_path, error = converter.convert_to_wav(test_mp3_file)
 
         assert success
-        assert '.converted.wav' in wav_path
-        assert 'test' in os.path.basename(wav_path)
+        converted = Path(wav_path)
+        assert converted.name.endswith('.converted.wav')
+        assert 'test' in converted.stem
 
-    def test_conversion_preserves_audio_data(self, converter, test_mp3_file):
+    @requires_ffmpeg
+    def test_conversion_preserves_audio_data(self, converter, test_mp3_file, cached_mp3_file):
         """Test that conversion preserves audio data approximately"""
-        # Get original duration
-        original_info = converter.get_audio_info(test_mp3_file)
-        original_duration = original_info['duration_seconds']
+        # Get original duration; test_mp3_file is a byte-for-byte copy of the
+        # cached source, so the probe is shared across the session
+        original_duration, _, _ = _probe(cached_mp3_file)
 
         # Convert to WAV
         success, wav_path, error = converter.convert_to_wav(test_mp3_file)
@@ -243,6 +335,7 @@ class TestAudioFormatConverter:
         # Duration should be approximately the same (allow 0.1s difference due to encoding)
         assert abs(original_duration - converted_duration) < 0.1
 
+    @requires_ffmpeg
     def test_multiple_conversions(self, converter, test_mp3_file):
         """Test multiple sequential conversions"""
         paths = []
@@ -262,14 +355,9 @@ class TestAudioFormatConverter:
             converter.cleanup_converted_file(path)
             assert not os.path.exists(path)
 
-    def test_corrupted_file_handling(self, converter, temp_dir):
+    def test_corrupted_file_handling(self, converter, corrupted_mp3_file):
         """Test handling of corrupted audio files"""
-        # Create a fake "MP3" file with garbage data
-        corrupted_file = os.path.join(temp_dir, 'corrupted.mp3')
-        with open(corrupted_file, 'wb') as f:
-            f.write(b'This is not a valid audio file')
-
-        success, wav_path, error = converter.convert_to_wav(corrupted_file)
+        success, wav_path, error = converter.convert_to_wav(corrupted_mp3_file)
 
         assert not success
         assert wav_path is None
@@ -279,15 +367,19 @@ class TestAudioFormatConverter:
 class TestAudioConverterIntegration:
     """Integration tests with SimpleAudioAnalyzer"""
 
-    def test_analyzer_with_mp3_file(self, test_mp3_file):
-        """Test that SimpleAudioAnalyzer can load MP3 files"""
+    @requires_ffmpeg
+    @pytest.mark.parametrize("source_file", ['test_mp3_file', 'test_m4a_file', 'test_flac_file'],
+                             indirect=True, ids=['mp3', 'm4a', 'flac'])
+    def test_analyzer_with_compressed_file(self, source_file):
+        """Test that SimpleAudioAnalyzer can load MP3, M4A and FLAC files"""
         from services.simple_audio_analyzer import SimpleAudioAnalyzer
 
         analyzer = SimpleAudioAnalyzer()
-        success = analyzer.load_audio(test_mp3_file)
+        success = analyzer.load_audio(source_file)
 
         if not success:
-            pytest.skip("MP3 loading failed - ffmpeg may not be installed")
+            label = os.path.splitext(source_file)[1].lstrip('.').upper()
+            pytest.skip(f"{label} loading failed - ffmpeg may not be installed")
 
         assert success
         assert analyzer.audio_data is not None
@@ -297,41 +389,8 @@ class TestAudioConverterIntegration:
         # Clean up converted file
         analyzer.cleanup()
 
-    def test_analyzer_with_m4a_file(self, test_m4a_file):
-        """Test that SimpleAudioAnalyzer can load M4A files"""
-        from services.simple_audio_analyzer import SimpleAudioAnalyzer
-
-        analyzer = SimpleAudioAnalyzer()
-        success = analyzer.load_audio(test_m4a_file)
-
-        if not success:
-            pytest.skip("M4A loading failed - ffmpeg may not be installed")
-
-        assert success
-        assert analyzer.audio_data is not None
-        assert analyzer.duration > 0
-
-        # Clean up converted file
-        analyzer.cleanup()
-
-    def test_analyzer_with_flac_file(self, test_flac_file):
-        """Test that SimpleAudioAnalyzer can load FLAC files"""
-        from services.simple_audio_analyzer import SimpleAudioAnalyzer
-
-        analyzer = SimpleAudioAnalyzer()
-        success = analyzer.load_audio(test_flac_file)
-
-        if not success:
-            pytest.skip("FLAC loading failed - ffmpeg may not be installed")
-
-        assert success
-        assert analyzer.audio_data is not None
-        assert analyzer.duration > 0
-
-        # Clean up converted file
-        analyzer.cleanup()
-
-    def test_analyzer_cleanup_on_delete(self, test_mp3_file, temp_dir):
+    @requires_ffmpeg
+    def test_analyzer_cleanup_on_delete(self, test_mp3_file, tmp_path):
         """Test that analyzer cleans up converted files when deleted"""
         from services.simple_audio_analyzer import SimpleAudioAnalyzer
 
@@ -1,150 +1,216 @@
 import pytest
 import os
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import soundfile as sf
+from scipy.io import wavfile
 from pathlib import Path
 from unittest.mock import patch, Mock
 
 from services.audio_analyzer import AudioAnalyzer
 
+# AudioAnalyzer.load_audio resamples everything to this rate by default,
+# so the source file's own rate has to be checked with sf.info
+ANALYZER_SAMPLE_RATE = 22050
+
+
+def _write_pcm16_wav(filepath, audio, sample_rate):
+    """Write plain 16-bit PCM WAV with scipy, skipping libsndfile's format setup"""
+    # Reproduces soundfile's PCM_16 output: the bundled libsndfile (1.2.x)
+    # scales by 2**15 and rounds toward -inf, not to nearest, before
+    # clipping; test_plain_wav_fixture_matches_soundfile checks it exactly
+    pcm = np.floor(np.asarray(audio) * 32768.0)
+    np.clip(pcm, -32768, 32767, out=pcm)
+    wavfile.write(filepath, sample_rate, pcm.astype(np.int16))
+
 
 class TestAudioFormats:
     """Test audio processing with various file formats"""
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def sample_audio_data(self):
-        """Generate sample audio data for testing"""
+        """Generate sample audio data for testing (shared, read-only)"""
         duration = 10.0  # 10 seconds
         sample_rate = 44100
-        t = np.linspace(0, duration, int(duration * sample_rate))
-
-        # Create realistic audio with speech-like patterns
-        audio = 0.3 * np.sin(2 * np.pi * 200 * t)  # Base frequency
-        audio += 0.1 * np.sin(2 * np.pi * 400 * t)  # Harmonic
-        audio *= (1 + 0.2 * np.random.random(len(audio)))  # Variation
+        samples = int(duration * sample_rate)
+        t = np.linspace(0, duration, samples, dtype=np.float32)
+
+        # Create realistic audio with speech-like patterns, built in place
+        # in float32; the time axis doubles as scratch for the later terms
+        audio = np.empty(samples, dtype=np.float32)
+        np.multiply(t, 2 * np.pi * 200, out=audio)  # Base frequency
+        np.sin(audio, out=audio)
+        audio *= 0.3
+
+        harmonic = np.multiply(t, 2 * np.pi * 400, out=t)  # Harmonic
+        np.sin(harmonic, out=harmonic)
+        harmonic *= 0.1
+        audio += harmonic
+
+        variation = np.random.default_rng(0).random(samples, dtype=np.float32, out=harmonic)
+        variation *= 0.2
+        variation += 1
+        audio *= variation  # Variation
 
         # Add some silence in the middle
         silence_start = int(4.5 * sample_rate)
         silence_end = int(5.5 * sample_rate)
         audio[silence_start:silence_end] *= 0.05  # Very quiet
 
+        # Shared across the session: tests derive new arrays, never write
+        audio.setflags(write=False)
         return audio, sample_rate
 
-    def create_test_audio_file(self, temp_dir, audio_data, sample_rate, format_name, subtype=None):
+    @pytest.fixture(scope="session")
+    def shared_wav_path(self, tmp_path_factory, sample_audio_data):
+        """Canonical 44.1 kHz mono WAV, written once for tests that only read it"""
+        audio, sample_rate = sample_audio_data
+        wav_path = tmp_path_factory.mktemp('formats_audio') / 'reference.wav'
+        _write_pcm16_wav(wav_path, audio, sample_rate)
+        return str(wav_path)
+
+    def create_test_audio_file(self, tmp_path, audio, sample_rate, format_name, subtype=None):
         """Helper to create test audio files in different formats"""
-        audio, sr = audio_data, sample_rate
         filename = f'test_audio.{format_name.lower()}'
-        filepath = os.path.join(temp_dir, filename)
+        filepath = os.path.join(tmp_path, filename)
 
         try:
             if subtype:
-                sf.write(filepath, audio, sr, subtype=subtype)
+                sf.write(filepath, audio, sample_rate, subtype=subtype)
+            elif format_name.lower() == 'wav':
+                # soundfile's default for WAV is PCM_16 as well; scipy writes
+                # that directly without libsndfile's format machinery
+                _write_pcm16_wav(filepath, audio, sample_rate)
             else:
-                sf.write(filepath, audio, sr)
+                sf.write(filepath, audio, sample_rate)
             return filepath
         except Exception as e:
             pytest.skip(f"Cannot create {format_name} file: {e}")
 
-    def test_wav_format_support(self, temp_dir, sample_audio_data):
+    def test_wav_format_support(self, tmp_path, sample_audio_data):
         """Test WAV format support (most common)"""
-        audio_file = self.create_test_audio_file(temp_dir, sample_audio_data, 44100, 'wav')
+        audio, _ = sample_audio_data
+
+        audio_file = self.create_test_audio_file(tmp_path, audio, 44100, 'wav')
 
         analyzer = AudioAnalyzer()
         success = analyzer.load_audio(audio_file)
 
         assert success == True
         assert analyzer.audio_data is not None
-        assert analyzer.sample_rate == 44100
+        assert sf.info(audio_file).samplerate == 44100
+        assert analyzer.sample_rate == ANALYZER_SAMPLE_RATE
         assert analyzer.duration > 9  # Should be ~10 seconds
 
-        # Test analysis functions work
-        silence = analyzer.detect_silence()
+        # Test analysis functions work; the fixture's quiet stretch sits
+        # around -38 dBFS, above detect_silence's -40 dB default
+        silence = analyzer.detect_silence(silence_threshold_db=-30)
         features = analyzer.analyze_audio_features()
 
         assert isinstance(silence, list)
         assert len(silence) >= 1  # Should detect the silence we added
         assert isinstance(features, dict)
 
-    def test_wav_different_bit_depths(self, temp_dir, sample_audio_data):
-        """Test WAV files with different bit depths"""
-        test_cases = [
-            ('PCM_16', '16-bit PCM'),
-            ('PCM_24', '24-bit PCM'),
-            ('PCM_32', '32-bit PCM'),
-            ('FLOAT', '32-bit float')
-        ]
-
-        for subtype, description in test_cases:
-            try:
-                audio_file = self.create_test_audio_file(
-                    temp_dir, sample_audio_data, 48000, 'wav', subtype=subtype
-                )
+    def test_plain_wav_fixture_matches_soundfile(self, tmp_path, sample_audio_data):
+        """Test that the scipy WAV writer matches soundfile's default PCM_16 output"""
+        audio, sample_rate = sample_audio_data
 
-                analyzer = AudioAnalyzer()
-                success = analyzer.load_audio(audio_file)
+        audio_file = self.create_test_audio_file(tmp_path, audio, sample_rate, 'wav')
+        reference_file = os.path.join(tmp_path, 'reference.wav')
+        sf.write(reference_file, audio, sample_rate)
+
+        info = sf.info(audio_file)
+        reference_info = sf.info(reference_file)
+        assert info.subtype == reference_info.subtype == 'PCM_16'
+        assert info.samplerate == reference_info.samplerate == sample_rate
+        assert info.frames == reference_info.frames == len(audio)
+
+        written, _ = sf.read(audio_file, dtype='int16')
+        reference, _ = sf.read(reference_file, dtype='int16')
+        np.testing.assert_array_equal(written, reference)
+
+        # Half-step and full-scale values separate flooring from rounding
+        # to nearest, and exercise the clip at both ends
+        edges = np.array([0.5, 1.5, 2.5, -0.5, -1.5, -2.5, 32767.5, -32768.5],
+                         dtype=np.float32) / np.float32(32768)
+        edge_file = os.path.join(tmp_path, 'edges.wav')
+        edge_reference = os.path.join(tmp_path, 'edges_reference.wav')
+        _write_pcm16_wav(edge_file, edges, sample_rate)
+        sf.write(edge_reference, edges, sample_rate)
+        np.testing.assert_array_equal(sf.read(edge_file, dtype='int16')[0],
+                                      sf.read(edge_reference, dtype='int16')[0])
+
+    @pytest.mark.parametrize("subtype,description", [
+        ('PCM_16', '16-bit PCM'),
+        ('PCM_24', '24-bit PCM'),
+        ('PCM_32', '32-bit PCM'),
+        ('FLOAT', '32-bit float')
+    ])
+    def test_wav_different_bit_depths(self, tmp_path, sample_audio_data, subtype, description):
+        """Test WAV files with different bit depths"""
+        audio, _ = sample_audio_data
 
-                assert success == True, f"Failed to load {description} WAV"
-                assert analyzer.sample_rate == 48000
+        audio_file = self.create_test_audio_file(
+            tmp_path, audio, 48000, 'wav', subtype=subtype
+        )
 
-                # Basic analysis should work
-                features = analyzer.analyze_audio_features()
-                assert 'duration' in features
+        analyzer = AudioAnalyzer()
+        success = analyzer.load_audio(audio_file)
 
-                print(f"✓ Successfully processed {description} WAV")
+        assert success == True, f"Failed to load {description} WAV"
+        info = sf.info(audio_file)
+        assert info.subtype == subtype
+        assert info.samplerate == 48000
+        assert analyzer.sample_rate == ANALYZER_SAMPLE_RATE
 
-            except Exception as e:
-                pytest.skip(f"Skipping {description}: {e}")
+        # Basic analysis should work
+        features = analyzer.analyze_audio_features()
+        assert 'duration' in features
 
-    def test_different_sample_rates(self, temp_dir, sample_audio_data):
+    @pytest.mark.parametrize("sr", [8000, 16000, 22050, 44100, 48000, 96000])
+    def test_different_sample_rates(self, tmp_path, sample_audio_data, resample_audio, sr):
         """Test audio files with different sample rates"""
-        sample_rates = [8000, 16000, 22050, 44100, 48000, 96000]
         audio, _ = sample_audio_data
 
-        for sr in sample_rates:
-            try:
-                # Resample audio data for different sample rates
-                if sr != 44100:
-                    # Simple resampling (for testing purposes)
-                    ratio = sr / 44100
-                    new_length = int(len(audio) * ratio)
-                    resampled_audio = np.interp(
-                        np.linspace(0, len(audio), new_length),
-                        np.arange(len(audio)),
-                        audio
-                    )
-                else:
-                    resampled_audio = audio
-
-                audio_file = self.create_test_audio_file(
-                    temp_dir, (resampled_audio, sr), sr, 'wav'
-                )
-
-                analyzer = AudioAnalyzer()
-                success = analyzer.load_audio(audio_file)
+        # Resample audio data for different sample rates
+        resampled_audio = resample_audio(audio, 44100, sr)
 
-                assert success == True, f"Failed to load {sr}Hz audio"
-                assert analyzer.sample_rate == sr
+        audio_file = self.create_test_audio_file(
+            tmp_path, resampled_audio, sr, 'wav'
+        )
 
-                # Analysis should work regardless of sample rate
-                silence = analyzer.detect_silence()
-                assert isinstance(silence, list)
+        analyzer = AudioAnalyzer()
+        success = analyzer.load_audio(audio_file)
 
-                print(f"✓ Successfully processed {sr}Hz audio")
+        assert success == True, f"Failed to load {sr}Hz audio"
+        assert sf.info(audio_file).samplerate == sr
+        assert analyzer.sample_rate == ANALYZER_SAMPLE_RATE
 
-            except Exception as e:
-                print(f"⚠ Skipping {sr}Hz: {e}")
+        # Analysis should work regardless of sample rate
+        silence = analyzer.detect_silence()
+        assert isinstance(silence, list)
 
-    def test_stereo_vs_mono(self, temp_dir, sample_audio_data):
+    def test_stereo_vs_mono(self, tmp_path, sample_audio_data):
         """Test both mono and stereo audio files"""
         audio, sample_rate = sample_audio_data
 
         # Test mono (original)
-        mono_file = self.create_test_audio_file(temp_dir, (audio, sample_rate), sample_rate, 'wav')
-
-        # Test stereo (duplicate to both channels)
-        stereo_audio = np.column_stack([audio, audio])
-        stereo_file = self.create_test_audio_file(temp_dir, (stereo_audio, sample_rate), sample_rate, 'wav')
+        mono_file = self.create_test_audio_file(tmp_path, audio, sample_rate, 'wav')
+
+        # Test stereo (duplicate to both channels); a zero-copy view is enough
+        # since the WAV writer materialises its own int16 buffer. The helper
+        # names files by format, so stereo goes in its own directory.
+        stereo_audio = np.broadcast_to(audio[:, None], (audio.shape[0], 2))
+        stereo_dir = tmp_path / 'stereo'
+        stereo_dir.mkdir()
+        stereo_file = self.create_test_audio_file(stereo_dir, stereo_audio, sample_rate, 'wav')
+
+        # The analyzer downmixes to mono, so channel counts come from the files
+        assert sf.info(mono_file).channels == 1
+        stereo_info = sf.info(stereo_file)
+        assert stereo_info.channels == 2
+        assert stereo_info.frames == len(audio)
 
         # Test mono file
         analyzer_mono = AudioAnalyzer()
@@ -160,14 +226,13 @@ class TestAudioFormats:
         mono_features = analyzer_mono.analyze_audio_features()
         stereo_features = analyzer_stereo.analyze_audio_features()
 
-        assert mono_features['channels'] == 1
-        assert stereo_features['channels'] == 2
+        assert mono_features['channels'] == stereo_features['channels'] == 1
 
         # Duration should be similar
         assert abs(mono_features['duration'] - stereo_features['duration']) < 0.1
 
     @patch('soundfile.read')
-    def test_mp3_format_simulation(self, mock_sf_read, temp_dir, sample_audio_data):
+    def test_mp3_format_simulation(self, mock_sf_read, tmp_path, sample_audio_data):
         """Test MP3 format support (simulated since soundfile might not support MP3)"""
         audio, sample_rate = sample_audio_data
 
@@ -175,7 +240,7 @@ class TestAudioFormats:
         mock_sf_read.return_value = (audio, sample_rate)
 
         # Create a fake MP3 file path
-        mp3_file = os.path.join(temp_dir, 'test.mp3')
+        mp3_file = os.path.join(tmp_path, 'test.mp3')
         with open(mp3_file, 'wb') as f:
             f.write(b'fake mp3 content')  # Just to make file exist
 
@@ -193,10 +258,12 @@ class TestAudioFormats:
             # Should fall back to librosa for MP3
             mock_librosa.assert_called_once()
 
-    def test_flac_format_support(self, temp_dir, sample_audio_data):
+    def test_flac_format_support(self, tmp_path, sample_audio_data):
         """Test FLAC format support if available"""
+        audio, _ = sample_audio_data
+
         try:
-            audio_file = self.create_test_audio_file(temp_dir, sample_audio_data, 44100, 'flac')
+            audio_file = self.create_test_audio_file(tmp_path, audio, 44100, 'flac')
 
             analyzer = AudioAnalyzer()
             success = analyzer.load_audio(audio_file)
@@ -213,10 +280,12 @@ class TestAudioFormats:
         except Exception as e:
             pytest.skip(f"FLAC support not available: {e}")
 
-    def test_ogg_format_support(self, temp_dir, sample_audio_data):
+    def test_ogg_format_support(self, tmp_path, sample_audio_data):
         """Test OGG format support if available"""
+        audio, _ = sample_audio_data
+
         try:
-            audio_file = self.create_test_audio_file(temp_dir, sample_audio_data, 44100, 'ogg')
+            audio_file = self.create_test_audio_file(tmp_path, audio, 44100, 'ogg')
 
             analyzer = AudioAnalyzer()
             success = analyzer.load_audio(audio_file)
@@ -232,10 +301,12 @@ class TestAudioFormats:
         except Exception as e:
             pytest.skip(f"OGG support not available: {e}")
 
-    def test_aiff_format_support(self, temp_dir, sample_audio_data):
+    def test_aiff_format_support(self, tmp_path, sample_audio_data):
         """Test AIFF format support"""
+        audio, _ = sample_audio_data
+
         try:
-            audio_file = self.create_test_audio_file(temp_dir, sample_audio_data, 44100, 'aiff')
+            audio_file = self.create_test_audio_file(tmp_path, audio, 44100, 'aiff')
 
             analyzer = AudioAnalyzer()
             success = analyzer.load_audio(audio_file)
@@ -251,10 +322,10 @@ class TestAudioFormats:
         except Exception as e:
             pytest.skip(f"AIFF support not available: {e}")
 
-    def test_unsupported_format_handling(self, temp_dir):
+    def test_unsupported_format_handling(self, tmp_path):
         """Test handling of unsupported audio formats"""
         # Create a fake file with unsupported extension
-        fake_file = os.path.join(temp_dir, 'test.xyz')
+        fake_file = os.path.join(tmp_path, 'test.xyz')
         with open(fake_file, 'wb') as f:
             f.write(b'fake audio content')
 
@@ -265,10 +336,10 @@ class TestAudioFormats:
         assert success == False
         assert analyzer.audio_data is None
 
-    def test_corrupted_file_handling(self, temp_dir):
+    def test_corrupted_file_handling(self, tmp_path):
         """Test handling of corrupted audio files"""
         # Create a corrupted WAV file
-        corrupted_file = os.path.join(temp_dir, 'corrupted.wav')
+        corrupted_file = os.path.join(tmp_path, 'corrupted.wav')
         with open(corrupted_file, 'wb') as f:
             f.write(b'RIFF    WAVEfmt corrupted content')
 
@@ -279,9 +350,9 @@ class TestAudioFormats:
         assert success == False
         assert analyzer.audio_data is None
 
-    def test_empty_file_handling(self, temp_dir):
+    def test_empty_file_handling(self, tmp_path):
         """Test handling of empty audio files"""
-        empty_file = os.path.join(temp_dir, 'empty.wav')
+        empty_file = os.path.join(tmp_path, 'empty.wav')
         with open(empty_file, 'wb') as f:
             pass  # Create empty file
 
@@ -291,7 +362,7 @@ class TestAudioFormats:
         assert success == False
         assert analyzer.audio_data is None
 
-    def test_very_short_audio(self, temp_dir):
+    def test_very_short_audio(self, tmp_path):
         """Test handling of very short audio files"""
         # Create very short audio (0.1 seconds)
         duration = 0.1
@@ -299,7 +370,7 @@ class TestAudioFormats:
         t = np.linspace(0, duration, int(duration * sample_rate))
         short_audio = 0.5 * np.sin(2 * np.pi * 440 * t)  # 440Hz tone
 
-        audio_file = self.create_test_audio_file(temp_dir, (short_audio, sample_rate), sample_rate, 'wav')
+        audio_file = self.create_test_audio_file(tmp_path, short_audio, sample_rate, 'wav')
 
         analyzer = AudioAnalyzer()
         success = analyzer.load_audio(audio_file)
@@ -321,7 +392,7 @@ class TestAudioFormats:
         except Exception as e:
             pytest.fail(f"Short audio analysis failed: {e}")
 
-    def test_very_long_audio_simulation(self, temp_dir):
+    def test_very_long_audio_simulation(self, tmp_path):
         """Test handling of longer audio files (simulated for speed)"""
         # Simulate longer audio without actually creating huge files
         duration = 1800.0  # 30 minutes
@@ -332,14 +403,13 @@ class TestAudioFormats:
         total_samples = int(duration * sample_rate)
         segment_samples = int(segment_duration * sample_rate)
 
-        # Create first segment with speech patterns
-        t = np.linspace(0, segment_duration, segment_samples)
-        audio_segment = 0.2 * np.sin(2 * np.pi * 200 * t)
-        audio_segment += 0.1 * np.sin(2 * np.pi * 400 * t)
-        audio_segment *= (1 + 0.3 * np.random.random(len(audio_segment)))
+        # Create first segment as a sparse click train: only its length is
+        # checked, and the clicks still give silence detection work to do
+        audio_segment = np.zeros(segment_samples, dtype=np.float32)
+        audio_segment[::100] = 0.5
 
         # Save just the segment for testing (representing larger file)
-        audio_file = self.create_test_audio_file(temp_dir, (audio_segment, sample_rate), sample_rate, 'wav')
+        audio_file = self.create_test_audio_file(tmp_path, audio_segment, sample_rate, 'wav')
 
         analyzer = AudioAnalyzer()
         success = analyzer.load_audio(audio_file)
@@ -357,13 +427,18 @@ class TestAudioFormats:
         assert isinstance(features, dict)
         assert features['duration'] > 9
 
-    def test_format_specific_metadata(self, temp_dir, sample_audio_data):
+    def test_format_specific_metadata(self, tmp_path, sample_audio_data, shared_wav_path):
         """Test extraction of format-specific metadata"""
+        audio, _ = sample_audio_data
+
         formats_to_test = ['wav', 'flac']  # Formats that support metadata
 
         for fmt in formats_to_test:
             try:
-                audio_file = self.create_test_audio_file(temp_dir, sample_audio_data, 44100, fmt)
+                if fmt == 'wav':
+                    audio_file = shared_wav_path
+                else:
+                    audio_file = self.create_test_audio_file(tmp_path, audio, 44100, fmt)
 
                 analyzer = AudioAnalyzer()
                 success = analyzer.load_audio(audio_file)
@@ -385,27 +460,20 @@ class TestAudioFormats:
             except Exception as e:
                 print(f"⚠ Skipping {fmt} metadata test: {e}")
 
-    def test_concurrent_format_loading(self, temp_dir, sample_audio_data):
+    def test_concurrent_format_loading(self, shared_wav_path):
         """Test loading multiple formats concurrently"""
-        formats = ['wav']  # Start with supported format
-        audio_files = []
+        # Start with supported format
+        audio_files = [(shared_wav_path, 'wav')]
 
-        # Create multiple files
-        for i, fmt in enumerate(formats):
-            try:
-                audio_file = self.create_test_audio_file(
-                    temp_dir, sample_audio_data, 44100, fmt
-                )
-                audio_files.append((audio_file, fmt))
-            except:
-                continue
-
-        # Load them with separate analyzer instances
-        results = []
-        for audio_file, fmt in audio_files:
+        def load_format(audio_entry):
+            audio_file, fmt = audio_entry
             analyzer = AudioAnalyzer()
             success = analyzer.load_audio(audio_file)
-            results.append((fmt, success, analyzer.duration if success else None))
+            return fmt, success, analyzer.duration if success else None
+
+        # Load them concurrently with separate analyzer instances
+        with ThreadPoolExecutor(max_workers=len(audio_files)) as executor:
+            results = list(executor.map(load_format, audio_files))
 
         # All should succeed
         successful_loads = [r for r in results if r[1] == True]
@@ -417,12 +485,12 @@ class TestAudioFormats:
             duration_variance = max(durations) - min(durations)
             assert duration_variance < 0.5, f"Duration variance too high: {duration_variance}"
 
-    def test_format_conversion_implications(self, temp_dir, sample_audio_data):
+    def test_format_conversion_implications(self, tmp_path, sample_audio_data):
         """Test implications of format conversion for analysis"""
         audio, sample_rate = sample_audio_data
 
         # Create reference WAV file
-        wav_file = self.create_test_audio_file(temp_dir, (audio, sample_rate), sample_rate, 'wav')
+        wav_file = self.create_test_audio_file(tmp_path, audio, sample_rate, 'wav')
 
         analyzer_wav = AudioAnalyzer()
         analyzer_wav.load_audio(wav_file)
@@ -430,7 +498,7 @@ class TestAudioFormats:
 
         # Compare with different formats if available
         try:
-            flac_file = self.create_test_audio_file(temp_dir, (audio, sample_rate), sample_rate, 'flac')
+            flac_file = self.create_test_audio_file(tmp_path, audio, sample_rate, 'flac')
 
             analyzer_flac = AudioAnalyzer()
             analyzer_flac.load_audio(flac_file)
@@ -445,11 +513,11 @@ class TestAudioFormats:
         except Exception as e:
             pytest.skip(f"Format comparison skipped: {e}")
 
-    def test_audio_format_recommendations(self, temp_dir, sample_audio_data):
+    def test_audio_format_recommendations(self, tmp_path, sample_audio_data):
         """Test system recommendations for different audio formats"""
         # Test with high quality audio
         hq_audio, _ = sample_audio_data
-        hq_file = self.create_test_audio_file(temp_dir, (hq_audio, 48000), 48000, 'wav', 'PCM_24')
+        hq_file = self.create_test_audio_file(tmp_path, hq_audio, 48000, 'wav', 'PCM_24')
 
         analyzer = AudioAnalyzer()
         if analyzer.load_audio(hq_file):
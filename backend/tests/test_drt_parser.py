@@ -17,11 +17,11 @@ class TestDRTParser:
         assert timeline.name == "Test Timeline"
         assert timeline.frame_rate == 25.0
 
-    def test_parse_drt_file(self, temp_dir, sample_drt_xml):
+    def test_parse_drt_file(self, tmp_path, sample_drt_xml):
         """Test parsing DRT file from disk"""
         # Create test DRT file
-        drt_file_path = os.path.join(temp_dir, 'test_timeline.drt')
-        with open(drt_file_path, 'w', encoding='utf-8') as f:
+        drt_file_path = os.path.join(tmp_path, 'test_timeline.drt')
+        with open(drt_file_path, 'wb') as f:
             f.write(sample_drt_xml)
 
         parser = DRTParser()
@@ -110,26 +110,35 @@ class TestDRTParser:
         assert "total_clips" in summary
         assert "total_tracks" in summary
 
+    def test_parse_content_bytes_matches_str(self, sample_drt_xml):
+        """Test that bytes and decoded text parse to the same timeline"""
+        parser = DRTParser()
+        from_bytes = parser.parse_content(sample_drt_xml)
+        from_str = parser.parse_content(sample_drt_xml.decode('utf-8'))
+
+        assert from_bytes.name == from_str.name
+        assert from_bytes.get_timeline_stats() == from_str.get_timeline_stats()
+
 class TestDRTWriter:
     """Test cases for DRT XML writer"""
 
-    def test_generate_basic_drt_xml(self, sample_timeline):
+    def test_generate_basic_drt_xml(self, sample_timeline_ro):
         """Test generating DRT XML from timeline"""
         writer = DRTWriter()
-        xml_content = writer.generate_drt_xml(sample_timeline)
+        xml_content = writer.generate_drt_xml(sample_timeline_ro)
 
         assert isinstance(xml_content, str)
         assert '<?xml version="1.0" encoding="UTF-8"?>' in xml_content
         assert '<!DOCTYPE xmeml>' in xml_content
         assert '<xmeml version="5">' in xml_content
-        assert sample_timeline.name in xml_content
+        assert sample_timeline_ro.name in xml_content
 
-    def test_write_timeline_to_file(self, sample_timeline, temp_dir):
+    def test_write_timeline_to_file(self, sample_timeline_ro, tmp_path):
         """Test writing timeline to file"""
         writer = DRTWriter()
-        output_path = os.path.join(temp_dir, 'output_timeline.drt')
+        output_path = os.path.join(tmp_path, 'output_timeline.drt')
 
-        success = writer.write_timeline(sample_timeline, output_path)
+        success = writer.write_timeline(sample_timeline_ro, output_path)
 
         assert success == True
         assert os.path.exists(output_path)
@@ -138,9 +147,9 @@ class TestDRTWriter:
         with open(output_path, 'r', encoding='utf-8') as f:
             content = f.read()
             assert '<?xml version="1.0" encoding="UTF-8"?>' in content
-            assert sample_timeline.name in content
+            assert sample_timeline_ro.name in content
 
-    def test_roundtrip_parse_write(self, sample_drt_xml, temp_dir):
+    def test_roundtrip_parse_write(self, sample_drt_xml, tmp_path):
         """Test parsing DRT and then writing it back (roundtrip)"""
         parser = DRTParser()
         writer = DRTWriter()
@@ -149,7 +158,7 @@ class TestDRTWriter:
         original_timeline = parser.parse_content(sample_drt_xml)
 
         # Write to file
-        output_path = os.path.join(temp_dir, 'roundtrip_timeline.drt')
+        output_path = os.path.join(tmp_path, 'roundtrip_timeline.drt')
         success = writer.write_timeline(original_timeline, output_path)
         assert success == True
 
@@ -173,10 +182,10 @@ class TestDRTWriter:
                 # Should have same number of clips (approximately - some rounding may occur)
                 assert abs(len(orig_track.clips) - len(new_track.clips)) <= 1
 
-    def test_create_track_element(self, sample_timeline):
+    def test_create_track_element(self, sample_timeline_ro):
         """Test creating track element XML"""
         writer = DRTWriter()
-        audio_track = sample_timeline.get_tracks_by_type('audio')[0]
+        audio_track = sample_timeline_ro.get_tracks_by_type('audio')[0]
 
         track_element = writer._create_track_element(audio_track, 25.0)
 
@@ -184,10 +193,10 @@ class TestDRTWriter:
         assert track_element.tag == 'track'
         assert len(list(track_element)) == len(audio_track.clips)  # Should have clipitem children
 
-    def test_create_clipitem_element(self, sample_timeline):
+    def test_create_clipitem_element(self, sample_timeline_ro):
         """Test creating clipitem element XML"""
         writer = DRTWriter()
-        audio_track = sample_timeline.get_tracks_by_type('audio')[0]
+        audio_track = sample_timeline_ro.get_tracks_by_type('audio')[0]
         clip = audio_track.clips[0]
 
         clipitem_element = writer._create_clipitem_element(clip, 25.0)
@@ -222,19 +231,19 @@ class TestDRTWriter:
         assert 'in' in children_tags
         assert 'out' in children_tags
 
-    def test_get_xml_preview(self, sample_timeline):
+    def test_get_xml_preview(self, sample_timeline_ro):
         """Test getting XML preview"""
         writer = DRTWriter()
-        preview = writer.get_xml_preview(sample_timeline, max_lines=10)
+        preview = writer.get_xml_preview(sample_timeline_ro, max_lines=10)
 
         assert isinstance(preview, str)
         lines = preview.split('\n')
         assert len(lines) <= 12  # max_lines + potential truncation message
 
         assert '<?xml version="1.0" encoding="UTF-8"?>' in preview
-        assert sample_timeline.name in preview
+        assert sample_timeline_ro.name in preview
 
-    def test_write_timeline_with_markers(self, temp_dir):
+    def test_write_timeline_with_markers(self, tmp_path):
         """Test writing timeline that includes markers"""
         # Create timeline with markers
         timeline = Timeline("Timeline with Markers", frame_rate=25.0)
@@ -248,7 +257,7 @@ class TestDRTWriter:
         timeline.add_marker(7.5, "Outro Marker", "Blue")
 
         writer = DRTWriter()
-        output_path = os.path.join(temp_dir, 'timeline_with_markers.drt')
+        output_path = os.path.join(tmp_path, 'timeline_with_markers.drt')
 
         success = writer.write_timeline(timeline, output_path)
         assert success == True
@@ -260,12 +269,12 @@ class TestDRTWriter:
             assert 'Outro Marker' in content
             assert '<marker>' in content
 
-    def test_write_empty_timeline(self, temp_dir):
+    def test_write_empty_timeline(self, tmp_path):
         """Test writing empty timeline"""
         timeline = Timeline("Empty Timeline")
 
         writer = DRTWriter()
-        output_path = os.path.join(temp_dir, 'empty_timeline.drt')
+        output_path = os.path.join(tmp_path, 'empty_timeline.drt')
 
         success = writer.write_timeline(timeline, output_path)
         assert success == True
@@ -276,10 +285,10 @@ class TestDRTWriter:
             assert '<?xml version="1.0" encoding="UTF-8"?>' in content
             assert "Empty Timeline" in content
 
-    def test_write_to_invalid_path(self, sample_timeline):
+    def test_write_to_invalid_path(self, sample_timeline_ro):
         """Test writing to invalid path returns False"""
         writer = DRTWriter()
         invalid_path = "/nonexistent/directory/timeline.drt"
 
-        success = writer.write_timeline(sample_timeline, invalid_path)
+        success = writer.write_timeline(sample_timeline_ro, invalid_path)
         assert success == False
\ No newline at end of file
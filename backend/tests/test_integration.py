@@ -20,7 +20,7 @@ class TestTimelineProcessingIntegration:
         return TimelineEditingEngine()
 
     @pytest.fixture
-    def real_audio_file(self, temp_dir):
+    def real_audio_file(self, tmp_path):
         """Create a realistic test audio file with speech patterns"""
         # Create more realistic audio data
         duration = 60.0  # 1 minute
@@ -64,13 +64,13 @@ class TestTimelineProcessingIntegration:
         audio[mask6] = 0.003 * np.random.random(np.sum(mask6))
 
         # Save to file
-        audio_file = os.path.join(temp_dir, 'realistic_audio.wav')
+        audio_file = os.path.join(tmp_path, 'realistic_audio.wav')
         sf.write(audio_file, audio, sample_rate)
 
         return audio_file
 
     @pytest.fixture
-    def realistic_drt_file(self, temp_dir):
+    def realistic_drt_file(self, tmp_path):
         """Create a realistic DRT file for testing"""
         drt_content = """<?xml version="1.0" encoding="UTF-8"?>
         <!DOCTYPE xmeml>
@@ -144,7 +144,7 @@ class TestTimelineProcessingIntegration:
             </project>
         </xmeml>"""
 
-        drt_file = os.path.join(temp_dir, 'realistic_timeline.drt')
+        drt_file = os.path.join(tmp_path, 'realistic_timeline.drt')
         with open(drt_file, 'w', encoding='utf-8') as f:
             f.write(drt_content)
 
@@ -296,7 +296,7 @@ class TestTimelineProcessingIntegration:
         # Should cover most of the audio (allowing for detection margins)
         assert total_covered >= analyzer.duration * 0.85
 
-    def test_drt_roundtrip_with_processing(self, realistic_drt_file, temp_dir):
+    def test_drt_roundtrip_with_processing(self, realistic_drt_file, tmp_path):
         """Test DRT parsing, processing, and writing roundtrip"""
         # Parse original
         parser = DRTParser()
@@ -315,7 +315,7 @@ class TestTimelineProcessingIntegration:
 
         # Write processed timeline
         writer = DRTWriter()
-        output_file = os.path.join(temp_dir, 'processed_timeline.drt')
+        output_file = os.path.join(tmp_path, 'processed_timeline.drt')
         success = writer.write_timeline(processed_timeline, output_file)
 
         assert success == True
@@ -401,14 +401,14 @@ class TestTimelineProcessingIntegration:
         # At least one should be different (aggressive vs conservative)
         assert not all(d == durations[0] for d in durations), "Different settings should produce different results"
 
-    def test_processing_empty_audio(self, timeline_editor, realistic_drt_file, temp_dir):
+    def test_processing_empty_audio(self, timeline_editor, realistic_drt_file, tmp_path):
         """Test processing with minimal/silent audio"""
         # Create very quiet audio file
         duration = 30.0
         sample_rate = 22050
         quiet_audio = 0.001 * np.random.random(int(duration * sample_rate))
 
-        quiet_audio_file = os.path.join(temp_dir, 'quiet_audio.wav')
+        quiet_audio_file = os.path.join(tmp_path, 'quiet_audio.wav')
         sf.write(quiet_audio_file, quiet_audio, sample_rate)
 
         processing_options = {
@@ -427,7 +427,7 @@ class TestTimelineProcessingIntegration:
         assert result['success'] == True
         assert result['timeline_comparison']['edited']['duration'] >= 0
 
-    def test_large_file_processing_simulation(self, timeline_editor, realistic_drt_file, temp_dir):
+    def test_large_file_processing_simulation(self, timeline_editor, realistic_drt_file, tmp_path):
         """Test processing simulation with larger file parameters"""
         # Create longer audio (simulate large file processing)
         duration = 300.0  # 5 minutes
@@ -454,7 +454,7 @@ class TestTimelineProcessingIntegration:
             speech *= (1 + 0.3 * np.random.random(len(speech)))
             audio[mask] = speech
 
-        large_audio_file = os.path.join(temp_dir, 'large_audio.wav')
+        large_audio_file = os.path.join(tmp_path, 'large_audio.wav')
         sf.write(large_audio_file, audio, sample_rate)
 
         processing_options = {
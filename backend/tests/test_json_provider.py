@@ -0,0 +1,91 @@
+import pytest
+import json
+from datetime import datetime
+from decimal import Decimal
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from utils.json_provider import OrjsonJSONProvider
+
+
+@pytest.fixture(scope="module")
+def json_app():
+    """Bare Flask app, enough to host the JSON providers"""
+    return Flask(__name__)
+
+
+@pytest.fixture
+def provider(json_app):
+    """orjson-backed provider under test"""
+    return OrjsonJSONProvider(json_app)
+
+
+@pytest.fixture
+def default(json_app):
+    """Flask's stdlib provider, the behaviour we mirror"""
+    return DefaultJSONProvider(json_app)
+
+
+class TestOrjsonJSONProvider:
+    """Test cases for the orjson-backed Flask JSON provider"""
+
+    def test_app_uses_orjson_provider(self):
+        """Test that the application installs the orjson provider"""
+        from app import app
+
+        assert isinstance(app.json, OrjsonJSONProvider)
+
+    def test_matches_default_documents(self, provider, default):
+        """Test that documents decode the same as the default provider's"""
+        payload = {
+            'job_id': 'test_job_123',
+            'created_at': datetime(2024, 1, 1, 12, 0, 0),
+            'stats': {'original_duration': 30.0, 'compression_ratio': 25.0 / 30.0, 'original_clips': 3},
+            'segments': [{'speaker': 'Speaker1', 'start_time': 0.5}, None, True]
+        }
+
+        encoded = provider.dumps(payload)
+        assert json.loads(encoded) == json.loads(default.dumps(payload))
+        assert json.loads(encoded)['created_at'] == 'Mon, 01 Jan 2024 12:00:00 GMT'
+        assert provider.loads(encoded) == json.loads(encoded)
+
+    def test_escapes_non_ascii_like_default(self, provider, default):
+        """Test that non-ASCII text is escaped exactly as the default provider does it"""
+        payload = {'speaker': 'Zoë', 'note': 'café ☕ 日本語'}
+
+        encoded = provider.dumps(payload)
+        assert encoded == default.dumps(payload)
+        assert encoded.isascii()
+        assert provider.loads(encoded) == payload
+        assert provider.loads('{"speaker": "Zoë"}') == {'speaker': 'Zoë'}
+
+    def test_falls_back_for_stdlib_options(self, provider):
+        """Test that calls with options orjson cannot honour use the stdlib path"""
+        encoded = provider.dumps({'ratio': Decimal('0.5')}, default=str)
+        assert json.loads(encoded) == {'ratio': '0.5'}
+
+        decoded = provider.loads('{"ratio": 0.1}', parse_float=Decimal)
+        assert decoded == {'ratio': Decimal('0.1')}
+        assert isinstance(decoded['ratio'], Decimal)
+
+    @pytest.mark.parametrize("value,stdlib_token", [
+        (float('nan'), 'NaN'),
+        (float('inf'), 'Infinity'),
+        (float('-inf'), '-Infinity'),
+    ])
+    def test_non_finite_floats_become_null(self, provider, default, value, stdlib_token):
+        """Test that NaN/Infinity serialise as null where the stdlib emits bare tokens"""
+        assert json.loads(provider.dumps({'value': value})) == {'value': None}
+        assert stdlib_token in default.dumps({'value': value})
+
+    @pytest.mark.parametrize("value", [-2**63, 2**63, 2**64 - 1])
+    def test_64_bit_integers_round_trip(self, provider, value):
+        """Test that integers inside orjson's 64-bit range are written in full"""
+        assert provider.loads(provider.dumps({'value': value})) == {'value': value}
+
+    @pytest.mark.parametrize("value", [-2**63 - 1, 2**64])
+    def test_integers_beyond_64_bits_raise(self, provider, default, value):
+        """Test that out-of-range integers raise where the stdlib writes them out"""
+        with pytest.raises(TypeError):
+            provider.dumps({'value': value})
+        assert json.loads(default.dumps({'value': value})) == {'value': value}
@@ -0,0 +1,125 @@
+import pytest
+from unittest.mock import patch
+
+from utils.monitoring import HealthChecker, SystemMonitor
+
+
+class FakeClock:
+    """Stand-in for time.time that only moves when told to"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Patch the monitoring module's clock with a controllable one"""
+    fake = FakeClock()
+    with patch('utils.monitoring.time.time', fake):
+        yield fake
+
+
+class TestHealthChecker:
+    """Test cases for HealthChecker result caching"""
+
+    @pytest.fixture
+    def counting_checker(self):
+        """Checker with one dependency check that counts its runs"""
+        calls = []
+
+        def check():
+            calls.append(1)
+            return {'message': f'run {len(calls)}'}
+
+        checker = HealthChecker()
+        checker.register_check('dependency', check)
+        return checker, calls
+
+    def test_run_all_checks_reuses_result_within_max_age(self, counting_checker, clock):
+        """Test that a result younger than max_age is served without re-running"""
+        checker, calls = counting_checker
+
+        first = checker.run_all_checks(max_age=30)
+        clock.now += 29
+        second = checker.run_all_checks(max_age=30)
+
+        assert len(calls) == 1
+        assert second['checks']['dependency'] is first['checks']['dependency']
+        assert second['overall_status'] == 'healthy'
+
+    def test_run_all_checks_reruns_after_max_age(self, counting_checker, clock):
+        """Test that a result older than max_age triggers a fresh check"""
+        checker, calls = counting_checker
+
+        checker.run_all_checks(max_age=30)
+        clock.now += 30
+        result = checker.run_all_checks(max_age=30)
+
+        assert len(calls) == 2
+        assert result['checks']['dependency']['message'] == 'run 2'
+
+    def test_run_all_checks_without_max_age_always_runs(self, counting_checker, clock):
+        """Test that the default max_age of 0 disables caching"""
+        checker, calls = counting_checker
+
+        checker.run_all_checks()
+        checker.run_all_checks()
+
+        assert len(calls) == 2
+
+    def test_failed_check_is_cached_until_max_age(self, clock):
+        """Test that an unhealthy result is also reused until it expires"""
+        outcomes = [RuntimeError('dependency down'), {'message': 'recovered'}]
+
+        def check():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        checker = HealthChecker()
+        checker.register_check('dependency', check)
+
+        assert checker.run_all_checks(max_age=30)['overall_status'] == 'unhealthy'
+
+        # Still within max_age: the failure is served from cache
+        clock.now += 10
+        cached = checker.run_all_checks(max_age=30)
+        assert cached['overall_status'] == 'unhealthy'
+        assert cached['checks']['dependency']['message'] == 'dependency down'
+        assert len(outcomes) == 1
+
+        # Expired: the check runs again and picks up the recovery
+        clock.now += 20
+        assert checker.run_all_checks(max_age=30)['overall_status'] == 'healthy'
+
+
+class TestSystemMonitor:
+    """Test cases for SystemMonitor CPU sampling"""
+
+    @pytest.fixture
+    def monitor(self):
+        """Monitor whose background sampling loop never runs"""
+        with patch.object(SystemMonitor, '_monitor_loop'):
+            yield SystemMonitor()
+
+    def test_health_status_without_sample_does_not_block(self, monitor):
+        """Test that a missing background sample falls back to a non-blocking reading"""
+        with patch('utils.monitoring.psutil.cpu_percent', return_value=12.5) as cpu_percent:
+            status = monitor.get_health_status()
+
+        cpu_percent.assert_called_once_with(interval=None)
+        assert status['system_metrics']['cpu_percent'] == 12.5
+
+    def test_health_status_reuses_background_sample(self, monitor):
+        """Test that the latest background sample is used without polling psutil"""
+        monitor.metrics_history.append({'timestamp': 0, 'cpu_percent': 42.0})
+
+        with patch('utils.monitoring.psutil.cpu_percent') as cpu_percent:
+            status = monitor.get_health_status()
+
+        cpu_percent.assert_not_called()
+        assert status['system_metrics']['cpu_percent'] == 42.0
@@ -132,7 +132,7 @@ class TestRealDRTFiles:
         # Should have basic content markers
         assert len(timeline.markers) == 4  # Opening, Presentation, Q&A, Closing
 
-    def test_roundtrip_parsing_all_files(self, drt_files, temp_dir):
+    def test_roundtrip_parsing_all_files(self, drt_files, tmp_path):
         """Test parsing and writing back all sample DRT files"""
         parser = DRTParser()
         writer = DRTWriter()
@@ -143,7 +143,7 @@ class TestRealDRTFiles:
             assert original_timeline is not None
 
             # Write to new file
-            output_file = os.path.join(temp_dir, f"roundtrip_{drt_file.name}")
+            output_file = os.path.join(tmp_path, f"roundtrip_{drt_file.name}")
             success = writer.write_timeline(original_timeline, output_file)
             assert success == True
             assert os.path.exists(output_file)
@@ -35,6 +35,9 @@ except (ImportError, ModuleNotFoundError):
 from services.simple_audio_analyzer import SimpleAudioAnalyzer
 from parsers.drt_parser import DRTParser
 from config import Config
+from utils.error_handlers import ValidationError
+from defusedxml import EntitiesForbidden
+from tests.xml_payloads import BILLION_LAUGHS_XML
 
 
 # ============================================================================
@@ -42,22 +45,15 @@ from config import Config
 # ============================================================================
 
 @pytest.fixture
-def temp_dir():
-    """Create a temporary directory for test files"""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield tmpdir
-
-
-@pytest.fixture
-def converter(temp_dir):
+def converter(tmp_path):
     """Create an AudioFormatConverter instance"""
     if not AUDIO_CONVERTER_AVAILABLE:
         pytest.skip("Audio converter dependencies not available")
-    return AudioFormatConverter(temp_dir)
+    return AudioFormatConverter(tmp_path)
 
 
 @pytest.fixture
-def test_wav_file(temp_dir):
+def test_wav_file(tmp_path):
     """Create a small test WAV file"""
     sample_rate = 22050
     duration = 1.0  # 1 second
@@ -67,7 +63,7 @@ def test_wav_file(temp_dir):
     audio_data = np.sin(2 * np.pi * frequency * t)
     audio_data = (audio_data * 32767).astype(np.int16)
 
-    wav_path = os.path.join(temp_dir, 'test.wav')
+    wav_path = os.path.join(tmp_path, 'test.wav')
     wavfile.write(wav_path, sample_rate, audio_data)
 
     return wav_path
@@ -81,9 +77,9 @@ def test_wav_file(temp_dir):
 class TestCommandInjectionPrevention:
     """Test prevention of command injection attacks via file paths"""
 
-    def test_semicolon_rejection(self, converter, temp_dir):
+    def test_semicolon_rejection(self, converter, tmp_path):
         """Test that semicolons in file paths are rejected"""
-        malicious_path = os.path.join(temp_dir, 'file;rm -rf /.wav')
+        malicious_path = os.path.join(tmp_path, 'file;rm -rf /.wav')
 
         valid, error = converter._validate_file_path(
             malicious_path,
@@ -93,9 +89,9 @@ class TestCommandInjectionPrevention:
         assert not valid
         assert ';' in error or 'Invalid characters' in error
 
-    def test_pipe_rejection(self, converter, temp_dir):
+    def test_pipe_rejection(self, converter, tmp_path):
         """Test that pipe operators in file paths are rejected"""
-        malicious_path = os.path.join(temp_dir, 'file|cat /etc/passwd.wav')
+        malicious_path = os.path.join(tmp_path, 'file|cat /etc/passwd.wav')
 
         valid, error = converter._validate_file_path(
             malicious_path,
@@ -105,9 +101,9 @@ class TestCommandInjectionPrevention:
         assert not valid
         assert '|' in error or 'Invalid characters' in error
 
-    def test_ampersand_rejection(self, converter, temp_dir):
+    def test_ampersand_rejection(self, converter, tmp_path):
         """Test that ampersands in file paths are rejected"""
-        malicious_path = os.path.join(temp_dir, 'file&whoami.wav')
+        malicious_path = os.path.join(tmp_path, 'file&whoami.wav')
 
         valid, error = converter._validate_file_path(
             malicious_path,
@@ -117,9 +113,9 @@ class TestCommandInjectionPrevention:
         assert not valid
         assert '&' in error or 'Invalid characters' in error
 
-    def test_backtick_rejection(self, converter, temp_dir):
+    def test_backtick_rejection(self, converter, tmp_path):
         """Test that backticks (command substitution) are rejected"""
-        malicious_path = os.path.join(temp_dir, 'file`whoami`.wav')
+        malicious_path = os.path.join(tmp_path, 'file`whoami`.wav')
 
         valid, error = converter._validate_file_path(
             malicious_path,
@@ -129,9 +125,9 @@ class TestCommandInjectionPrevention:
         assert not valid
         assert '`' in error or 'Invalid characters' in error
 
-    def test_dollar_rejection(self, converter, temp_dir):
+    def test_dollar_rejection(self, converter, tmp_path):
         """Test that dollar signs (variable expansion) are rejected"""
-        malicious_path = os.path.join(temp_dir, 'file$(whoami).wav')
+        malicious_path = os.path.join(tmp_path, 'file$(whoami).wav')
 
         valid, error = converter._validate_file_path(
             malicious_path,
@@ -141,9 +137,9 @@ class TestCommandInjectionPrevention:
         assert not valid
         assert '$' in error or 'Invalid characters' in error
 
-    def test_parenthesis_rejection(self, converter, temp_dir):
+    def test_parenthesis_rejection(self, converter, tmp_path):
         """Test that parentheses (subshell) are rejected"""
-        malicious_path = os.path.join(temp_dir, 'file(whoami).wav')
+        malicious_path = os.path.join(tmp_path, 'file(whoami).wav')
 
         valid, error = converter._validate_file_path(
             malicious_path,
@@ -153,9 +149,9 @@ class TestCommandInjectionPrevention:
         assert not valid
         assert '(' in error or 'Invalid characters' in error
 
-    def test_redirection_rejection(self, converter, temp_dir):
+    def test_redirection_rejection(self, converter, tmp_path):
         """Test that redirection operators are rejected"""
-        malicious_path = os.path.join(temp_dir, 'file>output.txt.wav')
+        malicious_path = os.path.join(tmp_path, 'file>output.txt.wav')
 
         valid, error = converter._validate_file_path(
             malicious_path,
@@ -165,9 +161,9 @@ class TestCommandInjectionPrevention:
         assert not valid
         assert '>' in error or 'Invalid characters' in error
 
-    def test_newline_rejection(self, converter, temp_dir):
+    def test_newline_rejection(self, converter, tmp_path):
         """Test that newlines in file paths are rejected"""
-        malicious_path = os.path.join(temp_dir, 'file\nrm -rf /.wav')
+        malicious_path = os.path.join(tmp_path, 'file\nrm -rf /.wav')
 
         valid, error = converter._validate_file_path(
             malicious_path,
@@ -177,9 +173,9 @@ class TestCommandInjectionPrevention:
         assert not valid
         assert 'Invalid characters' in error
 
-    def test_null_byte_rejection(self, converter, temp_dir):
+    def test_null_byte_rejection(self, converter, tmp_path):
         """Test that null bytes in file paths are rejected"""
-        malicious_path = os.path.join(temp_dir, 'file\x00.wav')
+        malicious_path = os.path.join(tmp_path, 'file\x00.wav')
 
         valid, error = converter._validate_file_path(
             malicious_path,
@@ -189,9 +185,9 @@ class TestCommandInjectionPrevention:
         assert not valid
         assert 'Invalid characters' in error
 
-    def test_safe_filename_passes(self, converter, temp_dir):
+    def test_safe_filename_passes(self, converter, tmp_path):
         """Test that safe filenames are allowed"""
-        safe_path = os.path.join(temp_dir, 'test-audio_file123.wav')
+        safe_path = os.path.join(tmp_path, 'test-audio_file123.wav')
 
         # Create the file so it exists
         Path(safe_path).touch()
@@ -213,9 +209,10 @@ class TestCommandInjectionPrevention:
 class TestPathTraversalPrevention:
     """Test prevention of path traversal attacks"""
 
-    def test_directory_traversal_rejection(self, converter, temp_dir):
+    def test_directory_traversal_rejection(self, converter, tmp_path):
         """Test that ../../../ path traversal is rejected"""
-        malicious_path = os.path.join(temp_dir, '../../../etc/passwd')
+        # Enough '..' to climb from tmp_path (however deep) to /etc/passwd
+        malicious_path = os.path.join(tmp_path, '../' * len(tmp_path.parts) + 'etc/passwd')
 
         valid, error = converter._validate_file_path(
             malicious_path,
@@ -237,14 +234,14 @@ class TestPathTraversalPrevention:
         assert not valid
         assert 'outside allowed directories' in error
 
-    def test_symlink_rejection(self, converter, temp_dir):
+    def test_symlink_rejection(self, converter, tmp_path):
         """Test that symbolic links are rejected"""
         # Create a regular file
-        target_file = os.path.join(temp_dir, 'target.wav')
+        target_file = os.path.join(tmp_path, 'target.wav')
         Path(target_file).touch()
 
         # Create a symlink to it
-        symlink_path = os.path.join(temp_dir, 'symlink.wav')
+        symlink_path = os.path.join(tmp_path, 'symlink.wav')
         try:
             os.symlink(target_file, symlink_path)
 
@@ -280,10 +277,10 @@ class TestPathTraversalPrevention:
 class TestResourceLimits:
     """Test enforcement of resource limits"""
 
-    def test_file_size_limit_enforcement(self, converter, temp_dir):
+    def test_file_size_limit_enforcement(self, converter, tmp_path):
         """Test that files exceeding size limit are rejected"""
         # Create a file that's "too large" (we'll mock the size check)
-        large_file = os.path.join(temp_dir, 'huge.wav')
+        large_file = os.path.join(tmp_path, 'huge.wav')
         Path(large_file).touch()
 
         # Set size to exceed limit
@@ -347,7 +344,7 @@ class TestResourceLimits:
 class TestCleanupAndMemory:
     """Test proper cleanup and memory management"""
 
-    def test_context_manager_cleanup(self, test_wav_file, temp_dir):
+    def test_context_manager_cleanup(self, test_wav_file, tmp_path):
         """Test that context manager cleans up resources"""
         # Use context manager
         with SimpleAudioAnalyzer() as analyzer:
@@ -372,7 +369,7 @@ class TestCleanupAndMemory:
         assert analyzer.audio_data is None
         assert analyzer._memory_usage_mb == 0
 
-    def test_temp_file_cleanup_on_success(self, converter, temp_dir, test_wav_file):
+    def test_temp_file_cleanup_on_success(self, converter, tmp_path, test_wav_file):
         """Test that temp files are cleaned up after successful conversion"""
         # This would require an actual conversion, which needs ffmpeg
         # For now, test that cleanup method exists
@@ -395,30 +392,30 @@ class TestCleanupAndMemory:
 class TestThreadSafety:
     """Test thread safety of audio converter"""
 
-    def test_singleton_pattern(self, temp_dir):
+    def test_singleton_pattern(self, tmp_path):
         """Test that get_converter returns singleton instance"""
         if not AUDIO_CONVERTER_AVAILABLE:
             pytest.skip("Audio converter dependencies not available")
 
-        converter1 = get_converter(temp_dir)
-        converter2 = get_converter(temp_dir)
+        converter1 = get_converter(tmp_path)
+        converter2 = get_converter(tmp_path)
 
         # Should be same instance
         assert converter1 is converter2
 
-    def test_concurrent_access(self, test_wav_file, temp_dir):
+    def test_concurrent_access(self, test_wav_file, tmp_path):
         """Test concurrent access to converter"""
         if not AUDIO_CONVERTER_AVAILABLE:
             pytest.skip("Audio converter dependencies not available")
 
-        converter = get_converter(temp_dir)
+        converter = get_converter(tmp_path)
         errors = []
 
         def validate_path():
             try:
                 valid, error = converter._validate_file_path(
                     test_wav_file,
-                    [temp_dir]
+                    [tmp_path]
                 )
                 if not valid:
                     errors.append(error)
@@ -439,12 +436,12 @@ class TestThreadSafety:
         # Should have no errors
         assert len(errors) == 0
 
-    def test_semaphore_limiting(self, temp_dir):
+    def test_semaphore_limiting(self, tmp_path):
         """Test that semaphore limits concurrent conversions"""
         if not AUDIO_CONVERTER_AVAILABLE:
             pytest.skip("Audio converter dependencies not available")
 
-        converter = get_converter(temp_dir)
+        converter = get_converter(tmp_path)
 
         # Try to acquire semaphore multiple times
         acquired_count = 0
@@ -468,7 +465,7 @@ class TestThreadSafety:
 class TestXXEPrevention:
     """Test prevention of XXE (XML External Entity) attacks"""
 
-    def test_xxe_entity_expansion_blocked(self, temp_dir):
+    def test_xxe_entity_expansion_blocked(self, tmp_path):
         """Test that XXE entity expansion attacks are blocked"""
         malicious_xml = """<?xml version="1.0"?>
 <!DOCTYPE foo [
@@ -478,7 +475,7 @@ class TestXXEPrevention:
   <name>&xxe;</name>
 </timeline>
 """
-        xml_file = os.path.join(temp_dir, 'malicious.drt')
+        xml_file = os.path.join(tmp_path, 'malicious.drt')
         with open(xml_file, 'w') as f:
             f.write(malicious_xml)
 
@@ -495,7 +492,18 @@ class TestXXEPrevention:
             error_str = str(e).lower()
             assert 'entitiesforbidden' in error_str or 'entity' in error_str or 'forbidden' in error_str
 
-    def test_external_entity_blocked(self, temp_dir):
+    def test_billion_laughs_rejected(self):
+        """Test that nested entity expansion is refused at the DTD, not expanded"""
+        parser = DRTParser()
+
+        with pytest.raises(ValidationError) as exc_info:
+            parser.parse_content(BILLION_LAUGHS_XML)
+
+        # defusedxml's EntitiesForbidden is mapped to our ValidationError
+        assert isinstance(exc_info.value.__cause__, EntitiesForbidden)
+        assert 'entitiesforbidden' in str(exc_info.value).lower()
+
+    def test_external_entity_blocked(self, tmp_path):
         """Test that external entity references are blocked"""
         malicious_xml = """<?xml version="1.0"?>
 <!DOCTYPE foo [
@@ -505,7 +513,7 @@ class TestXXEPrevention:
   <name>&xxe;</name>
 </timeline>
 """
-        xml_file = os.path.join(temp_dir, 'external_entity.drt')
+        xml_file = os.path.join(tmp_path, 'external_entity.drt')
         with open(xml_file, 'w') as f:
             f.write(malicious_xml)
 
@@ -520,7 +528,7 @@ class TestXXEPrevention:
             # Defusedxml should block this
             pass
 
-    def test_safe_xml_parses_correctly(self, temp_dir):
+    def test_safe_xml_parses_correctly(self, tmp_path):
         """Test that safe XML still parses correctly"""
         safe_xml = """<?xml version="1.0"?>
 <timeline>
@@ -528,7 +536,7 @@ class TestXXEPrevention:
   <frame_rate>25.0</frame_rate>
 </timeline>
 """
-        xml_file = os.path.join(temp_dir, 'safe.drt')
+        xml_file = os.path.join(tmp_path, 'safe.drt')
         with open(xml_file, 'w') as f:
             f.write(safe_xml)
 
@@ -551,11 +559,11 @@ class TestXXEPrevention:
 class TestIntegrationSecurity:
     """Integration tests for security across components"""
 
-    def test_end_to_end_malicious_filename(self, converter, temp_dir, test_wav_file):
+    def test_end_to_end_malicious_filename(self, converter, tmp_path, test_wav_file):
         """Test end-to-end handling of malicious filename"""
         # Try to convert a file with malicious name
         malicious_name = 'file;rm -rf /.wav'
-        malicious_path = os.path.join(temp_dir, malicious_name)
+        malicious_path = os.path.join(tmp_path, malicious_name)
 
         # Copy test file to malicious name
         try:
@@ -571,7 +579,7 @@ class TestIntegrationSecurity:
         assert not success
         assert error is not None
 
-    def test_resource_exhaustion_protection(self, converter, temp_dir):
+    def test_resource_exhaustion_protection(self, converter, tmp_path):
         """Test protection against resource exhaustion"""
         # Try to trigger multiple concurrent conversions beyond limit
         results = []
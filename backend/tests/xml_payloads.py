@@ -0,0 +1,22 @@
+"""
+Malicious XML payloads shared by the security tests and test_critical_fixes.py
+"""
+
+
+def _billion_laughs(depth=10, fanout=10):
+    entities = ['  <!ENTITY lol0 "lol">']
+    for i in range(1, depth):
+        refs = f'&lol{i - 1};' * fanout
+        entities.append(f'  <!ENTITY lol{i} "{refs}">')
+
+    return (
+        '<?xml version="1.0"?>\n'
+        '<!DOCTYPE lolz [\n' + '\n'.join(entities) + '\n]>\n'
+        '<timeline>\n'
+        f'  <name>&lol{depth - 1};</name>\n'
+        '</timeline>\n'
+    )
+
+
+# Nested entity expansion payload (~10^9 'lol's if ever expanded)
+BILLION_LAUGHS_XML = _billion_laughs()
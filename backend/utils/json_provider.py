@@ -0,0 +1,50 @@
+"""
+Flask JSON provider backed by orjson
+"""
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+class OrjsonJSONProvider(DefaultJSONProvider):
+    """
+    Drop-in replacement for Flask's DefaultJSONProvider using orjson.
+
+    Output matches the default provider: keys are sorted, and datetimes,
+    UUIDs, dataclasses and ``__html__`` objects go through Flask's own
+    ``default`` hook, so dates stay RFC 822 strings rather than ISO 8601.
+    Calls with json.dumps/json.loads options orjson cannot honour fall
+    back to the stdlib implementation, as do non-ASCII documents while
+    ``ensure_ascii`` is set, since orjson always emits raw UTF-8.
+
+    Two deliberate differences from the stdlib provider remain:
+
+    * NaN and +/-Infinity serialise as ``null`` instead of the non-standard
+      ``NaN``/``Infinity`` tokens, so responses stay valid JSON.
+    * Integers outside the range [-2**63, 2**64) raise TypeError instead
+      of being written out in full.
+    """
+
+    _OPTIONS = (
+        orjson.OPT_SORT_KEYS
+        | orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+    def dumps(self, obj, **kwargs) -> str:
+        indent = kwargs.get('indent')
+        options = {key: value for key, value in kwargs.items() if key not in ('indent', 'separators')}
+        if options or indent not in (None, 2):
+            return super().dumps(obj, **kwargs)
+
+        option = self._OPTIONS | (orjson.OPT_INDENT_2 if indent else 0)
+        encoded = orjson.dumps(obj, default=self.default, option=option)
+        if self.ensure_ascii and not encoded.isascii():
+            return super().dumps(obj, **kwargs)
+        return encoded.decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
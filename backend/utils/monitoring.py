@@ -2,7 +2,7 @@ import time
 import psutil
 import logging
 import threading
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from collections import deque, defaultdict
 from datetime import datetime, timedelta
 import json
@@ -46,11 +46,31 @@ class SystemMonitor:
                 logger.error(f"Error in monitoring loop: {e}")
                 time.sleep(60)  # Wait longer on error
 
-    def _collect_system_metrics(self) -> Dict[str, Any]:
-        """Collect current system metrics"""
+    def _latest_cpu_percent(self) -> float:
+        """
+        CPU usage from the most recent background sample
+
+        Before the first sample exists, fall back to a non-blocking reading
+        (usage since the previous psutil call) so request paths never stall.
+        """
+        with self.lock:
+            if self.metrics_history:
+                cpu_percent = self.metrics_history[-1].get('cpu_percent')
+                if cpu_percent is not None:
+                    return cpu_percent
+        return psutil.cpu_percent(interval=None)
+
+    def _collect_system_metrics(self, cpu_percent: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Collect current system metrics
+
+        Pass cpu_percent to reuse an existing CPU sample; otherwise a fresh
+        one is taken, which blocks for one second.
+        """
         try:
             # CPU and Memory
-            cpu_percent = psutil.cpu_percent(interval=1)
+            if cpu_percent is None:
+                cpu_percent = psutil.cpu_percent(interval=1)
             memory = psutil.virtual_memory()
             disk = psutil.disk_usage('/')
 
@@ -94,8 +114,8 @@ class SystemMonitor:
 
     def get_health_status(self) -> Dict[str, Any]:
         """Get comprehensive health status"""
+        current_metrics = self._collect_system_metrics(self._latest_cpu_percent())
         with self.lock:
-            current_metrics = self._collect_system_metrics()
             uptime_seconds = time.time() - self.start_time
 
             # Determine overall health
@@ -170,11 +190,12 @@ class SystemMonitor:
 
     def export_metrics(self) -> Dict[str, Any]:
         """Export all metrics for external monitoring systems"""
+        system_metrics = self._collect_system_metrics(self._latest_cpu_percent())
         with self.lock:
             return {
                 'timestamp': time.time(),
                 'uptime': time.time() - self.start_time,
-                'system_metrics': self._collect_system_metrics(),
+                'system_metrics': system_metrics,
                 'request_metrics': dict(self.request_metrics),
                 'error_metrics': dict(self.error_metrics),
                 'processing_metrics': self.processing_metrics.copy(),
@@ -257,13 +278,24 @@ class HealthChecker:
 
         return check_result
 
-    def run_all_checks(self) -> Dict[str, Any]:
-        """Run all registered health checks"""
+    def run_all_checks(self, max_age: float = 0) -> Dict[str, Any]:
+        """
+        Run all registered health checks
+
+        Results younger than max_age seconds are reused instead of running
+        the check again. Failed results are cached the same way, so an
+        outage or a recovery is reported up to max_age seconds late.
+        """
         results = {}
         overall_status = 'healthy'
+        now = time.time()
 
-        for name in self.checks:
-            result = self.run_check(name)
+        for name, check_info in self.checks.items():
+            last_check = check_info['last_check']
+            if last_check is not None and now - last_check < max_age:
+                result = check_info['last_result']
+            else:
+                result = self.run_check(name)
             results[name] = result
 
             if result['status'] != 'healthy':